@@ -2,7 +2,6 @@
 Viral Hook Generator - Main Orchestrator
 Generates viral 12-second hooks for any affiliate marketing vertical
 """
-import json
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -10,7 +9,7 @@ from typing import Dict, List, Optional
 from config import Config
 from modules.gemini_analyzer import GeminiVideoAnalyzer
 from modules.sora_transformer import SoraAdTransformer
-from modules.aggression_variants import AggressionVariantGenerator
+from modules.aggression_variants import get_variant_generator
 from modules.sora_prompt_builder import SoraPromptBuilder
 from modules.sora_client import SoraClient
 from modules.video_assembler import VideoAssembler
@@ -19,6 +18,7 @@ from modules.prompt_validator import PromptValidator
 from modules.cost_optimizer import CostOptimizer
 from modules.ab_testing import ABTestingSuite
 from modules.utils import normalize_spokesperson
+from modules.persistence import dumps_json
 from pipeline_integrator import PipelineIntegrator
 
 
@@ -41,7 +41,7 @@ class Scene1Generator:
 
         self.analyzer = GeminiVideoAnalyzer()
         self.transformer = SoraAdTransformer()  # Transform ads for Sora
-        self.variant_generator = AggressionVariantGenerator()
+        self.variant_generator = get_variant_generator()
         self.prompt_builder = SoraPromptBuilder()  # Build Sora prompts (active)
         self.prompt_validator = PromptValidator()  # Validate before API calls
         self.sora_client = SoraClient(spaces_client=spaces_client, session_id=session_id)
@@ -378,8 +378,7 @@ class Scene1Generator:
 
             # Save all prompts to file for detailed inspection
             prompts_file = Path(analysis_path).parent / f"sora_prompts_{Path(analysis_path).stem}.json"
-            with open(prompts_file, 'w') as f:
-                json.dump(variant_prompts, f, indent=2)
+            prompts_file.write_bytes(dumps_json(variant_prompts))
             print(f"✓ All prompts saved to: {prompts_file}")
 
             # Save prompts metadata and create scene records in generation history
@@ -711,7 +710,6 @@ if __name__ == "__main__":
 
     # Save results
     results_path = Config.OUTPUT_DIR / 'results.json'
-    with open(results_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    results_path.write_bytes(dumps_json(results))
 
     print(f"\nResults saved to: {results_path}")
@@ -5,7 +5,10 @@ Tracks performance metrics, manages test variants, and provides statistical anal
 for optimizing ad generation strategies.
 """
 
+import atexit
 import json
+import queue
+import threading
 import time
 import uuid
 from typing import Dict, List, Optional, Tuple
@@ -52,6 +55,72 @@ class TestSummary:
     recommendations: List[str]
 
 
+# Write-behind queue shared by every suite: results are persisted by a single
+# background thread in batches so record_result() never blocks on disk I/O.
+# Entries are suites with unsaved results; None tells the writer to stop.
+_WRITE_BATCH_MAX = 64
+_write_q: "queue.Queue[Optional[ABTestingSuite]]" = queue.Queue()
+_writer_lock = threading.Lock()
+_writer: Optional[threading.Thread] = None
+
+
+def _writer_loop():
+    """Drain queued suites and persist their results in batches (group commit)"""
+    while True:
+        batch = [_write_q.get()]
+
+        # Coalesce everything queued while the previous write was running
+        while len(batch) < _WRITE_BATCH_MAX:
+            try:
+                batch.append(_write_q.get_nowait())
+            except queue.Empty:
+                break
+
+        # One rewrite per suite, however many results it queued
+        suites = {id(s): s for s in batch if s is not None}
+        for suite in suites.values():
+            try:
+                suite._save_results()
+            except Exception as e:
+                print(f"⚠️ Failed to persist A/B test results: {e}")
+
+        stop = None in batch
+        count = len(batch)
+        # Drop our references before waking flush() callers so a suite that
+        # is otherwise unreferenced is not finalized on this thread
+        del suites, batch
+        for _ in range(count):
+            _write_q.task_done()
+        if stop:
+            return
+
+
+def _schedule_results_write(suite: "ABTestingSuite"):
+    """Queue a results write for suite, starting the writer thread if needed"""
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(
+                target=_writer_loop, name="ab-results-writer", daemon=True
+            )
+            _writer.start()
+        _write_q.put_nowait(suite)
+
+
+def _stop_writer():
+    """Write any pending results and stop the writer thread (runs at exit)"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+        if writer is None or not writer.is_alive():
+            return
+        _write_q.put_nowait(None)
+    writer.join()
+
+
+atexit.register(_stop_writer)
+
+
 class ABTestingSuite:
     """
     A/B Testing suite for ad generation optimization.
@@ -74,20 +143,22 @@ class ABTestingSuite:
         self.tests_file = self.data_dir / "tests.json"
         self.results_file = self.data_dir / "results.json"
         
-        # Load existing data
+        # Load existing data, after any results still queued by other suites
+        # have reached disk
+        _write_q.join()
         self.tests = self._load_tests()
         self.results = self._load_results()
-    
+
     def _load_tests(self) -> Dict:
         """Load existing tests from storage"""
-        if self.tests_file.exists():
+        if self.tests_file.exists() and self.tests_file.stat().st_size:
             with open(self.tests_file, 'r') as f:
                 return json.load(f)
         return {}
     
     def _load_results(self) -> List[Dict]:
         """Load existing results from storage"""
-        if self.results_file.exists():
+        if self.results_file.exists() and self.results_file.stat().st_size:
             with open(self.results_file, 'r') as f:
                 return json.load(f)
         return []
@@ -101,7 +172,11 @@ class ABTestingSuite:
         """Save results to storage"""
         with open(self.results_file, 'w') as f:
             json.dump(self.results, f, indent=2)
-    
+
+    def flush(self):
+        """Block until all pending results have been written to disk"""
+        _write_q.join()
+
     def create_test(self, test_name: str, description: str, variants: List[Dict]) -> str:
         """
         Create a new A/B test.
@@ -196,8 +271,8 @@ class ABTestingSuite:
         )
         
         self.results.append(asdict(result))
-        self._save_results()
-        
+        _schedule_results_write(self)
+
         return result.result_id
     
     def get_test_results(self, test_id: str) -> List[Dict]:
@@ -2,12 +2,12 @@
 Ad Evaluator
 Analyzes and rates the quality of generated ads
 """
-import json
 from typing import Dict
 from pathlib import Path
 from modules.gemini_analyzer import GeminiVideoAnalyzer
 import google.generativeai as genai
 from config import Config
+from modules.persistence import dumps_json
 
 
 class AdEvaluator:
@@ -55,30 +55,38 @@ class AdEvaluator:
         }
 
         if generated_analysis:
+            # Lowercase the transcript once and share it with every check
+            gen_script_lower = generated_analysis.get('script', {}).get('full_transcript', '').lower()
+
             # Compare key aspects
-            evaluation['comparison'] = self._compare_ads(original_analysis, generated_analysis)
+            evaluation['comparison'] = self._compare_ads(
+                original_analysis, generated_analysis, gen_script_lower
+            )
 
             # Rate the generated ad
-            evaluation['ratings'] = self._rate_ad(generated_analysis, prompts_used)
+            evaluation['ratings'] = self._rate_ad(generated_analysis, prompts_used, gen_script_lower)
 
             # Generate recommendations
             evaluation['recommendations'] = self._generate_recommendations(
                 original_analysis,
                 generated_analysis,
-                prompts_used
+                prompts_used,
+                gen_script_lower
             )
 
         return evaluation
 
-    def _compare_ads(self, original: Dict, generated: Dict) -> Dict:
+    def _compare_ads(self, original: Dict, generated: Dict, gen_script_lower: str = None) -> Dict:
         """Compare original and generated ads"""
         comparison = {}
 
         # Compare script/message
         orig_script = original.get('script', {}).get('full_transcript', '')
         gen_script = generated.get('script', {}).get('full_transcript', '')
+        if gen_script_lower is None:
+            gen_script_lower = gen_script.lower()
 
-        comparison['script_similarity'] = self._calculate_similarity(orig_script, gen_script)
+        comparison['script_similarity'] = self._calculate_similarity(orig_script.lower(), gen_script_lower)
         comparison['original_script'] = orig_script
         comparison['generated_script'] = gen_script
 
@@ -87,7 +95,6 @@ class AdEvaluator:
         comparison['original_vertical'] = orig_vertical
 
         # Detect generated vertical from script
-        gen_script_lower = gen_script.lower()
         if any(word in gen_script_lower for word in ['insurance', 'car insurance', 'premium']):
             gen_vertical = 'auto_insurance'
         elif any(word in gen_script_lower for word in ['health', 'medical', 'doctor']):
@@ -116,19 +123,22 @@ class AdEvaluator:
         return comparison
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate rough similarity between two texts"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        """Calculate rough similarity between two already-lowercased texts"""
+        words1 = set(text1.split())
+        words2 = set(text2.split())
 
         if not words1 or not words2:
             return 0.0
 
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        # Probe the smaller set against the larger; |A ∪ B| = |A| + |B| - |A ∩ B|
+        # so the union never has to be materialized
+        if len(words1) > len(words2):
+            words1, words2 = words2, words1
+        shared = len(words1.intersection(words2))
 
-        return len(intersection) / len(union) if union else 0.0
+        return shared / (len(words1) + len(words2) - shared)
 
-    def _rate_ad(self, analysis: Dict, prompts: list) -> Dict:
+    def _rate_ad(self, analysis: Dict, prompts: list, script_lower: str = None) -> Dict:
         """Rate the generated ad on multiple criteria"""
         ratings = {}
 
@@ -138,7 +148,7 @@ class AdEvaluator:
 
         # Message clarity
         script = analysis.get('script', {}).get('full_transcript', '')
-        ratings['message_clarity'] = self._rate_message_clarity(script)
+        ratings['message_clarity'] = self._rate_message_clarity(script, script_lower)
 
         # Pacing
         pacing = analysis.get('pacing', {})
@@ -167,15 +177,17 @@ class AdEvaluator:
 
         return min(score, 10.0)
 
-    def _rate_message_clarity(self, script: str) -> float:
+    def _rate_message_clarity(self, script: str, script_lower: str = None) -> float:
         """Rate message clarity 0-10"""
         if not script:
             return 0.0
 
         score = 5.0
+        if script_lower is None:
+            script_lower = script.lower()
 
         # Check for key elements
-        if any(word in script.lower() for word in ['save', 'money', 'free', 'fast', 'easy']):
+        if any(word in script_lower for word in ['save', 'money', 'free', 'fast', 'easy']):
             score += 2.0
         if '$' in script:  # Has specific pricing
             score += 1.5
@@ -222,13 +234,16 @@ class AdEvaluator:
         else:
             return "POOR - Needs significant improvement"
 
-    def _generate_recommendations(self, original: Dict, generated: Dict, prompts: list) -> list:
+    def _generate_recommendations(self, original: Dict, generated: Dict, prompts: list,
+                                  gen_script_lower: str = None) -> list:
         """Generate improvement recommendations"""
         recommendations = []
 
         # Check vertical match
         orig_vertical = original.get('vertical', 'unknown')
-        gen_script = generated.get('script', {}).get('full_transcript', '').lower()
+        gen_script = gen_script_lower
+        if gen_script is None:
+            gen_script = generated.get('script', {}).get('full_transcript', '').lower()
 
         # Check if generated content matches original vertical
         vertical_keywords = {
@@ -274,8 +289,7 @@ class AdEvaluator:
 
     def save_evaluation_report(self, evaluation: Dict, output_path: str):
         """Save comprehensive evaluation report"""
-        with open(output_path, 'w') as f:
-            json.dump(evaluation, f, indent=2)
+        Path(output_path).write_bytes(dumps_json(evaluation))
 
         # Also create a human-readable summary
         summary_path = output_path.replace('.json', '_summary.txt')
@@ -2,30 +2,169 @@
 Aggression Variation Generator
 Generates 4 variations of the same ad with different aggression levels
 """
+import copy
 import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from config import Config
+from modules.persistence import dumps_json
 from modules.settings_manager import get_settings_manager
 
 
+# Map base emotions to aggression-appropriate versions
+_EMOTION_MAP = {
+    'soft': {
+        'frustrated': 'thoughtfully concerned',
+        'excited': 'pleasantly surprised',
+        'urgent': 'gently insistent',
+        'confident': 'calmly assured',
+        'worried': 'quietly concerned',
+        'determined': 'steadily focused'
+    },
+    'medium': {
+        'frustrated': 'determined to help',
+        'excited': 'confidently enthusiastic',
+        'urgent': 'focused and direct',
+        'confident': 'professionally assured',
+        'worried': 'actively addressing',
+        'determined': 'purposefully driven'
+    },
+    'aggressive': {
+        'frustrated': 'fed up and taking action',
+        'excited': 'fired up with energy',
+        'urgent': 'intensely driven',
+        'confident': 'boldly assertive',
+        'worried': 'urgently concerned',
+        'determined': 'fiercely committed'
+    },
+    'ultra': {
+        'frustrated': 'explosively candid',
+        'excited': 'wildly enthusiastic',
+        'urgent': 'relentlessly compelling',
+        'confident': 'unshakably bold',
+        'worried': 'dramatically alarmed',
+        'determined': 'unstoppably fierce'
+    }
+}
+
+# Aggression levels, in the order variants are generated
+_LEVELS = ('soft', 'medium', 'aggressive', 'ultra')
+
+# Separator line for variant summaries
+_SUMMARY_SEP = '-' * 50
+
+# Flattened (level, base emotion) -> phrase lookup
+_FLAT_EMOTION_MAP = {
+    (level, base): phrase
+    for level, phrases in _EMOTION_MAP.items()
+    for base, phrase in phrases.items()
+}
+
+# Base emotions in match priority order
+_BASE_EMOTIONS = tuple(_EMOTION_MAP['soft'])
+
+# Single-pass matcher for every base emotion
+_BASE_EMOTION_RE = re.compile('|'.join(map(re.escape, _BASE_EMOTIONS)))
+
+
+# After the settings store fails to connect, skip retrying it for this long
+# (a failed connect is slow and get_variant_generator() checks it every run)
+_SETTINGS_RETRY_SECONDS = 60.0
+_settings_failed_at: Optional[float] = None
+
+
+def _get_settings_manager():
+    """get_settings_manager(), or None while the settings store is unavailable"""
+    global _settings_failed_at
+    if _settings_failed_at is not None and time.monotonic() - _settings_failed_at < _SETTINGS_RETRY_SECONDS:
+        return None
+
+    # Only connecting to the settings store is expected to fail (missing
+    # Supabase credentials, client errors)
+    try:
+        settings_manager = get_settings_manager()
+    except Exception as e:
+        print(f"⚠ Settings error: {e}, loading default presets")
+        _settings_failed_at = time.monotonic()
+        return None
+
+    _settings_failed_at = None
+    return settings_manager
+
+
+@lru_cache(maxsize=4)
+def _load_presets(path_str: str, mtime: float) -> Dict:
+    """
+    Parse a presets JSON file; keyed on mtime so edits are picked up
+
+    The cached dict is shared by every caller, so never return it directly:
+    go through _get_default_presets(), which hands out deep copies.
+    """
+    with open(path_str, 'r') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=512)
+def _map_emotion(original_emotion: str, aggression_level: str) -> Optional[str]:
+    """
+    Map an analysis emotion to its aggression-level phrase
+
+    Scene emotions repeat heavily across an analysis, so results are memoized.
+
+    Args:
+        original_emotion: Original emotion from analysis
+        aggression_level: The aggression level (soft, medium, aggressive, ultra)
+
+    Returns:
+        Mapped emotion phrase, or None if no base emotion matched
+    """
+    hits = set(_BASE_EMOTION_RE.findall(original_emotion.lower()))
+    if not hits:
+        return None
+
+    # Resolve multiple hits by priority, not by position in the text
+    base_emotion = next(base for base in _BASE_EMOTIONS if base in hits)
+    return _FLAT_EMOTION_MAP.get((aggression_level, base_emotion))
+
+
 class AggressionVariantGenerator:
     """Generates variations of ads with different aggression/energy levels"""
 
     def __init__(self):
         """Load aggression presets from settings"""
-        try:
-            settings_manager = get_settings_manager()
+        # Preset parsing errors surface; only a missing store falls back
+        settings_manager = _get_settings_manager()
+
+        # Settings version the presets were loaded at (None without a store)
+        self.settings_version = None if settings_manager is None else settings_manager.version
+
+        if settings_manager is None:
+            self.presets = self._get_default_presets()
+        else:
+            # get_aggression_presets() already returns {} on query failures
             self.presets = settings_manager.get_aggression_presets()
 
             # Verify we got all 4 presets
-            required_levels = ['soft', 'medium', 'aggressive', 'ultra']
-            if not all(level in self.presets for level in required_levels):
+            if not all(level in self.presets for level in _LEVELS):
                 print("⚠ Missing presets in settings, loading from fallback")
                 self.presets = self._get_default_presets()
-        except Exception as e:
-            print(f"⚠ Settings error: {e}, loading default presets")
-            self.presets = self._get_default_presets()
+
+        # Global style depends only on the preset, so build it once per level
+        self._global_styles = {
+            level: {
+                'lighting': preset.get('lighting'),
+                'music': preset.get('music'),
+                'color_palette': preset.get('color_palette'),
+                'transitions': preset.get('transitions'),
+                'energy_level': preset.get('energy_level')
+            }
+            for level, preset in self.presets.items()
+        }
 
     def generate_variants(self, analysis: Dict) -> List[Dict]:
         """
@@ -39,7 +178,7 @@ class AggressionVariantGenerator:
         """
         variants = []
 
-        for level in ['soft', 'medium', 'aggressive', 'ultra']:
+        for level in _LEVELS:
             preset = self.presets[level]
             variant = self._create_variant(analysis, level, preset)
             variants.append(variant)
@@ -67,52 +206,48 @@ class AggressionVariantGenerator:
             'modified_scenes': []
         }
 
+        # Scene modifiers depend only on the preset; each scene gets its own copy
+        modifiers = {
+            'lighting': preset['lighting'],
+            'tone': preset['tone'],
+            'pacing': preset['pacing'],
+            'camera_movement': preset['camera_movement'],
+            'energy_level': preset['energy_level'],
+            'emotion_keywords': preset['emotion_keywords']
+        }
+
         # Modify each scene with aggression parameters
         for scene in analysis.get('scene_breakdown', []):
-            modified_scene = self._modify_scene(scene, preset, level)
+            modified_scene = self._modify_scene(scene, modifiers, level, preset['emotion_keywords'])
             variant['modified_scenes'].append(modified_scene)
 
-        # Add global style modifications
-        variant['global_style'] = {
-            'lighting': preset['lighting'],
-            'music': preset['music'],
-            'color_palette': preset['color_palette'],
-            'transitions': preset['transitions'],
-            'energy_level': preset['energy_level']
-        }
+        # Add global style modifications (copied: the generator is shared
+        # across runs, so callers must not be able to edit its styles)
+        variant['global_style'] = dict(self._global_styles[level])
 
         return variant
 
-    def _modify_scene(self, scene: Dict, preset: Dict, level: str) -> Dict:
+    def _modify_scene(self, scene: Dict, modifiers: Dict, level: str, emotion_keywords: List[str]) -> Dict:
         """
         Modify a single scene with aggression preset
 
         Args:
             scene: Original scene dictionary
-            preset: Aggression preset
+            modifiers: Shared aggression modifiers for this variant
             level: Aggression level name (soft, medium, aggressive, ultra)
+            emotion_keywords: Emotion keywords for this aggression level
 
         Returns:
             Modified scene dictionary
         """
-        modified = scene.copy()
-
-        # Apply preset modifications
-        modified['aggression_modifiers'] = {
-            'lighting': preset['lighting'],
-            'tone': preset['tone'],
-            'pacing': preset['pacing'],
-            'camera_movement': preset['camera_movement'],
-            'energy_level': preset['energy_level'],
-            'emotion_keywords': preset['emotion_keywords']
+        # Overlay the preset modifications and the level-adjusted emotion in a
+        # single dict build (stays a plain dict so scenes remain JSON-serializable)
+        return {
+            **scene,
+            'aggression_modifiers': {**modifiers, 'emotion_keywords': list(emotion_keywords)},
+            'emotion': self._adjust_emotion(scene.get('emotion', ''), emotion_keywords, level)
         }
 
-        # Modify emotion based on aggression level
-        original_emotion = scene.get('emotion', '')
-        modified['emotion'] = self._adjust_emotion(original_emotion, preset['emotion_keywords'], level)
-
-        return modified
-
     def _adjust_emotion(self, original_emotion: str, emotion_keywords: List[str], aggression_level: str = 'medium') -> str:
         """
         Adjust emotion description based on aggression level with coherent mapping
@@ -125,55 +260,10 @@ class AggressionVariantGenerator:
         Returns:
             Coherent single emotion phrase (no contradictions)
         """
-        # Map base emotions to aggression-appropriate versions
-        emotion_map = {
-            'soft': {
-                'frustrated': 'thoughtfully concerned',
-                'excited': 'pleasantly surprised',
-                'urgent': 'gently insistent',
-                'confident': 'calmly assured',
-                'worried': 'quietly concerned',
-                'determined': 'steadily focused'
-            },
-            'medium': {
-                'frustrated': 'determined to help',
-                'excited': 'confidently enthusiastic',
-                'urgent': 'focused and direct',
-                'confident': 'professionally assured',
-                'worried': 'actively addressing',
-                'determined': 'purposefully driven'
-            },
-            'aggressive': {
-                'frustrated': 'fed up and taking action',
-                'excited': 'fired up with energy',
-                'urgent': 'intensely driven',
-                'confident': 'boldly assertive',
-                'worried': 'urgently concerned',
-                'determined': 'fiercely committed'
-            },
-            'ultra': {
-                'frustrated': 'explosively candid',
-                'excited': 'wildly enthusiastic',
-                'urgent': 'relentlessly compelling',
-                'confident': 'unshakably bold',
-                'worried': 'dramatically alarmed',
-                'determined': 'unstoppably fierce'
-            }
-        }
-        
-        # Extract base emotion from original
-        original_lower = original_emotion.lower()
-        base_emotion = None
-        
-        for base in emotion_map.get(aggression_level, {}).keys():
-            if base in original_lower:
-                base_emotion = base
-                break
-        
-        # Return mapped emotion or use first aggression keyword
-        if base_emotion and aggression_level in emotion_map:
-            return emotion_map[aggression_level][base_emotion]
-        
+        mapped = _map_emotion(original_emotion, aggression_level)
+        if mapped:
+            return mapped
+
         # Fallback to primary emotion keyword
         return emotion_keywords[0] if emotion_keywords else 'confident'
 
@@ -181,9 +271,22 @@ class AggressionVariantGenerator:
         """
         Get default aggression presets (fallback)
 
+        Reads templates/aggression_presets.json (parsed once per file
+        modification) and falls back to the built-in presets below.
+
         Returns:
             Dictionary of default presets
         """
+        presets_path = Config.TEMPLATES_DIR / 'aggression_presets.json'
+        try:
+            presets = _load_presets(str(presets_path), presets_path.stat().st_mtime)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read {presets_path.name}: {e}, using built-in presets")
+        else:
+            if all(level in presets for level in _LEVELS):
+                return copy.deepcopy(presets)
+            print(f"⚠ Missing presets in {presets_path.name}, using built-in presets")
+
         return {
             "soft": {
                 "name": "Soft/Consultative",
@@ -250,21 +353,120 @@ class AggressionVariantGenerator:
         Returns:
             List of saved file paths
         """
-        saved_paths = []
+        prefix = base_filename or "variant"
+        records = self._detach_analysis(variants, prefix)
 
-        for variant in variants:
-            level = variant['variant_level']
-            filename = f"{base_filename}_{level}.json" if base_filename else f"variant_{level}.json"
-            filepath = Config.ANALYSIS_DIR / filename
+        def _write_one(record: Dict) -> str:
+            filepath = Config.ANALYSIS_DIR / f"{prefix}_{record['variant_level']}.json"
+            filepath.write_bytes(dumps_json(record))
+            return str(filepath)
 
-            with open(filepath, 'w') as f:
-                json.dump(variant, f, indent=2)
+        # Variant files are independent; write them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            saved_paths = list(executor.map(_write_one, records))
 
-            saved_paths.append(str(filepath))
+        for variant, filepath in zip(variants, saved_paths):
             print(f"Saved {variant['variant_name']}: {filepath}")
 
         return saved_paths
 
+    def save_variants_jsonl(self, variants: List[Dict], base_filename: str = None) -> str:
+        """
+        Save all variants to a single JSON Lines file (one variant per line)
+
+        Cheaper than save_variants when the variants are read back together:
+        one file, one write.
+
+        Args:
+            variants: List of variant dictionaries
+            base_filename: Optional base filename
+
+        Returns:
+            Path to the saved file
+        """
+        prefix = base_filename or "variant"
+        records = self._detach_analysis(variants, prefix)
+
+        filepath = Config.ANALYSIS_DIR / f"{prefix}_variants.jsonl"
+        filepath.write_bytes(b"".join(dumps_json(r, indent=None) + b"\n" for r in records))
+
+        print(f"Saved {len(records)} variants: {filepath}")
+        return str(filepath)
+
+    def _detach_analysis(self, variants: List[Dict], prefix: str) -> List[Dict]:
+        """
+        Write the shared source analysis once and swap it for a reference
+
+        All variants from generate_variants share the same analysis object;
+        it is saved to {prefix}_analysis.json and each returned variant
+        carries an 'analysis_ref' to it instead (see load_variant).
+
+        Returns:
+            Variant dictionaries ready to serialize
+        """
+        analysis = variants[0].get('original_analysis') if variants else None
+        if analysis is None:
+            return list(variants)
+
+        analysis_filename = f"{prefix}_analysis.json"
+        (Config.ANALYSIS_DIR / analysis_filename).write_bytes(dumps_json(analysis))
+
+        records = []
+        for variant in variants:
+            if variant.get('original_analysis') is analysis:
+                variant = {k: v for k, v in variant.items() if k != 'original_analysis'}
+                variant['analysis_ref'] = analysis_filename
+            records.append(variant)
+        return records
+
+    @staticmethod
+    def load_variants_jsonl(filepath: str) -> List[Dict]:
+        """
+        Load variants written by save_variants_jsonl
+
+        Args:
+            filepath: Path to the variants JSONL file
+
+        Returns:
+            List of variant dictionaries with 'original_analysis' restored
+        """
+        filepath = Path(filepath)
+        with open(filepath, 'r') as f:
+            variants = [json.loads(line) for line in f if line.strip()]
+
+        # Variants share one analysis file; parse it once
+        analysis_cache = {}
+        for variant in variants:
+            analysis_ref = variant.pop('analysis_ref', None)
+            if analysis_ref:
+                if analysis_ref not in analysis_cache:
+                    with open(filepath.parent / analysis_ref, 'r') as f:
+                        analysis_cache[analysis_ref] = json.load(f)
+                variant['original_analysis'] = analysis_cache[analysis_ref]
+        return variants
+
+    @staticmethod
+    def load_variant(filepath: str) -> Dict:
+        """
+        Load a saved variant, resolving its shared analysis reference
+
+        Args:
+            filepath: Path to a variant JSON file written by save_variants
+
+        Returns:
+            Variant dictionary with 'original_analysis' restored
+        """
+        filepath = Path(filepath)
+        with open(filepath, 'r') as f:
+            variant = json.load(f)
+
+        analysis_ref = variant.pop('analysis_ref', None)
+        if analysis_ref:
+            with open(filepath.parent / analysis_ref, 'r') as f:
+                variant['original_analysis'] = json.load(f)
+
+        return variant
+
     def get_variant_summary(self, variant: Dict) -> str:
         """
         Get a human-readable summary of a variant
@@ -275,15 +477,46 @@ class AggressionVariantGenerator:
         Returns:
             Summary string
         """
-        return f"""
-{variant['variant_name'].upper()}
-{'-' * 50}
-Description: {variant['variant_description']}
-Energy Level: {variant['global_style']['energy_level']}
-Lighting: {variant['global_style']['lighting']}
-Music: {variant['global_style']['music']}
-Scenes: {len(variant['modified_scenes'])}
-        """.strip()
+        global_style = variant['global_style']
+        return "\n".join((
+            variant['variant_name'].upper(),
+            _SUMMARY_SEP,
+            f"Description: {variant['variant_description']}",
+            f"Energy Level: {global_style['energy_level']}",
+            f"Lighting: {global_style['lighting']}",
+            f"Music: {global_style['music']}",
+            f"Scenes: {len(variant['modified_scenes'])}"
+        ))
+
+
+# Singleton instance
+_variant_generator = None
+_variant_generator_lock = threading.Lock()
+
+
+def _settings_version() -> Optional[int]:
+    """Current settings version, or None if the settings store is unavailable"""
+    settings_manager = _get_settings_manager()
+    return None if settings_manager is None else settings_manager.version
+
+
+def get_variant_generator() -> AggressionVariantGenerator:
+    """
+    Get variant generator singleton
+
+    Rebuilt whenever settings have changed since it was created, so preset
+    edits made through the settings endpoints apply to the next run.
+    """
+    global _variant_generator
+    version = _settings_version()
+    generator = _variant_generator
+    if generator is None or generator.settings_version != version:
+        with _variant_generator_lock:
+            # Re-check: another thread may have rebuilt it while we waited
+            if _variant_generator is None or _variant_generator.settings_version != version:
+                _variant_generator = AggressionVariantGenerator()
+            generator = _variant_generator
+    return generator
 
 
 # Test function
@@ -302,7 +535,7 @@ if __name__ == "__main__":
         analysis, _ = analyzer.analyze_and_save(video_path)
 
     # Generate variants
-    generator = AggressionVariantGenerator()
+    generator = get_variant_generator()
     variants = generator.generate_variants(analysis)
 
     # Print summaries
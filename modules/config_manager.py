@@ -4,10 +4,19 @@ Consolidates configuration from 4+ sources into single interface
 Priority: ENV → Database → Defaults
 """
 import os
+import threading
+import time
 from typing import Any, Dict, Optional
 from pathlib import Path
 
 
+# Resolved values are re-read after this long (matches the SettingsManager TTL)
+_CACHE_TTL = 300.0
+
+# Marks a key with no configured value, so callers' defaults aren't cached
+_MISSING = object()
+
+
 class ConfigManager:
     """
     Centralized configuration management
@@ -66,6 +75,13 @@ class ConfigManager:
         }
     }
 
+    # SECTION DISPATCH: section -> (defaults, SettingsManager accessor)
+    _SECTIONS = {
+        'sora': (SORA_DEFAULTS, 'get_sora_config'),
+        'gemini': (GEMINI_DEFAULTS, 'get_gemini_prompts'),
+        'aggression': (AGGRESSION_PRESETS, 'get_aggression_presets')
+    }
+
     # FILE PATHS
     BASE_DIR = Path(__file__).parent.parent
     OUTPUT_DIR = BASE_DIR / 'output'
@@ -80,17 +96,27 @@ class ConfigManager:
         Args:
             use_database: Whether to load from database (requires SettingsManager)
         """
+        # Database settings are connected lazily on first use (see _get_db)
         self._db_settings = None
         self._use_database = use_database
 
-        # Try to load from database
-        if use_database:
+        # Resolved values keyed by (section, key); cleared by invalidate(),
+        # when settings are written, and after _CACHE_TTL for outside edits
+        self._cache: Dict[tuple, Any] = {}
+        self._cached_at = time.monotonic()
+        self._settings_version = None
+
+    def _get_db(self):
+        """Get the SettingsManager, importing it on first use"""
+        if self._db_settings is None and self._use_database:
             try:
                 from modules.settings_manager import get_settings_manager
                 self._db_settings = get_settings_manager()
+                self._settings_version = self._db_settings.version
             except Exception as e:
                 print(f"⚠ Could not load database settings: {e}")
-                self._db_settings = None
+                self._use_database = False
+        return self._db_settings
 
     def get(self, section: str, key: str, default: Any = None) -> Any:
         """
@@ -104,53 +130,72 @@ class ConfigManager:
         Returns:
             Configuration value
         """
+        self._expire_cache()
+
+        cache_key = (section, key)
+        try:
+            value = self._cache[cache_key]
+        except KeyError:
+            value = self._cache[cache_key] = self._resolve(section, key)
+
+        return default if value is _MISSING else value
+
+    def _resolve(self, section: str, key: str) -> Any:
+        """Resolve a value through the priority hierarchy (uncached)"""
         # Priority 1: Environment variable
         env_key = f"{section.upper()}_{key.upper()}"
         env_value = os.getenv(env_key)
         if env_value is not None:
             return env_value
 
+        defaults, db_method = self._SECTIONS.get(section, (None, None))
+
         # Priority 2: Database settings
-        if self._db_settings:
+        db_settings = self._get_db() if db_method else None
+        if db_settings:
             try:
-                if section == 'sora':
-                    db_value = self._db_settings.get_sora_config().get(key)
-                    if db_value is not None:
-                        return db_value
-                elif section == 'gemini':
-                    db_value = self._db_settings.get_gemini_prompts().get(key)
-                    if db_value is not None:
-                        return db_value
-                elif section == 'aggression':
-                    presets = self._db_settings.get_aggression_presets()
-                    if key in presets:
-                        return presets[key]
+                db_value = getattr(db_settings, db_method)().get(key)
+                if db_value is not None:
+                    return db_value
             except:
                 pass
 
         # Priority 3: Defaults
-        if section == 'sora':
-            return self.SORA_DEFAULTS.get(key, default)
-        elif section == 'gemini':
-            return self.GEMINI_DEFAULTS.get(key, default)
-        elif section == 'aggression':
-            return self.AGGRESSION_PRESETS.get(key, default)
-
-        return default
+        if defaults is None:
+            return _MISSING
+        return defaults.get(key, _MISSING)
+
+    def invalidate(self):
+        """Drop cached values so the next reads see updated settings"""
+        self._cache.clear()
+        self._cached_at = time.monotonic()
+
+    def _expire_cache(self):
+        """Invalidate if settings were written or the cache has gone stale"""
+        db_settings = self._db_settings
+        version = db_settings.version if db_settings is not None else None
+        if version != self._settings_version or time.monotonic() - self._cached_at >= _CACHE_TTL:
+            self._settings_version = version
+            self.invalidate()
+
+    def _get_section(self, section: str) -> Dict[str, Any]:
+        """Get a complete section, cached alongside individual keys"""
+        self._expire_cache()
+
+        cache_key = (section, None)
+        config = self._cache.get(cache_key)
+        if config is None:
+            defaults = self._SECTIONS[section][0]
+            config = self._cache[cache_key] = {key: self.get(section, key) for key in defaults}
+        return dict(config)
 
     def get_sora_config(self) -> Dict[str, Any]:
         """Get complete Sora configuration"""
-        config = {}
-        for key in self.SORA_DEFAULTS:
-            config[key] = self.get('sora', key)
-        return config
+        return self._get_section('sora')
 
     def get_gemini_config(self) -> Dict[str, Any]:
         """Get complete Gemini configuration"""
-        config = {}
-        for key in self.GEMINI_DEFAULTS:
-            config[key] = self.get('gemini', key)
-        return config
+        return self._get_section('gemini')
 
     def get_aggression_preset(self, level: str) -> Optional[Dict]:
         """Get aggression preset by level"""
@@ -158,9 +203,10 @@ class ConfigManager:
 
     def get_all_aggression_presets(self) -> Dict:
         """Get all aggression presets"""
-        if self._db_settings:
+        db_settings = self._get_db()
+        if db_settings:
             try:
-                return self._db_settings.get_aggression_presets()
+                return db_settings.get_aggression_presets()
             except:
                 pass
         return self.AGGRESSION_PRESETS.copy()
@@ -219,6 +265,7 @@ class ConfigManager:
 
 # Singleton instance
 _config_manager = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager(use_database: bool = True) -> ConfigManager:
@@ -233,5 +280,8 @@ def get_config_manager(use_database: bool = True) -> ConfigManager:
     """
     global _config_manager
     if _config_manager is None:
-        _config_manager = ConfigManager(use_database=use_database)
+        with _config_manager_lock:
+            # Re-check: another thread may have built it while we waited
+            if _config_manager is None:
+                _config_manager = ConfigManager(use_database=use_database)
     return _config_manager
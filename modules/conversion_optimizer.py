@@ -12,46 +12,74 @@ class ConversionOptimizer:
     def __init__(self):
         # Pattern interrupts by vertical
         self.pattern_interrupts = {
-            'auto_insurance': [
+            'auto_insurance': (
                 'Suddenly noticing high insurance bill on phone',
                 'Frustrated reaction to renewal letter',
                 'Eyes widening at calculator total',
                 'Double-take at monthly payment amount'
-            ],
-            'health_insurance': [
+            ),
+            'health_insurance': (
                 'Shocked reaction to medical bill',
                 'Overwhelmed by prescription costs',
                 'Relief finding solution'
-            ],
-            'finance': [
+            ),
+            'finance': (
                 'Surprised by bank account notification',
                 'Excited discovery on investment app',
                 'Relieved finding savings solution'
-            ]
+            )
         }
         
         # Social proof visual cues
-        self.social_proof_cues = [
+        self.social_proof_cues = (
             'notification showing "thousands qualified"',
             'success counter ticking up',
             'testimonial quotes appearing',
             'check marks appearing next to benefits'
-        ]
+        )
         
         # Urgency builders for B-roll
         self.urgency_visuals = {
-            'time_based': [
+            'time_based': (
                 'clock ticking',
                 'calendar pages flipping',
                 'countdown timer visual'
-            ],
-            'scarcity': [
+            ),
+            'scarcity': (
                 'limited spots remaining indicator',
                 'offer expiring soon visual',
                 'exclusive access badge'
-            ]
+            )
         }
 
+        # Scroll-stoppers by aggression level
+        self.scroll_stoppers = {
+            'soft': (
+                'Unexpected moment of genuine surprise',
+                'Authentic spontaneous reaction'
+            ),
+            'medium': (
+                'Dramatic gesture emphasizing key point',
+                'Sudden reveal of important information'
+            ),
+            'aggressive': (
+                'Bold, attention-grabbing action',
+                'High-energy unexpected movement'
+            ),
+            'ultra': (
+                'Explosive reaction or reveal',
+                'Shocking visual contrast'
+            )
+        }
+
+        # Fallbacks resolved up front so lookups are a single dict.get
+        self._default_interrupts = self.pattern_interrupts['auto_insurance']
+        self._default_stoppers = self.scroll_stoppers['medium']
+
+        # Private generator so batch runs don't contend on the module-global one
+        self._rng = random.Random()
+        self._choice = self._rng.choice
+
     def enhance_character_prompt(self, prompt: str, vertical: str, scene_purpose: str) -> str:
         """
         Add conversion elements to character scene prompt
@@ -64,24 +92,24 @@ class ConversionOptimizer:
         Returns:
             Enhanced prompt with conversion triggers
         """
+        scene = {'vertical': vertical, 'purpose': scene_purpose, 'has_character': True}
+        return prompt + self._build_appendix(scene, {})
+
+    def _character_enhancements(self, vertical: str, purpose: str) -> List[str]:
+        """Conversion element lines for a character scene (purpose lowercased)"""
         enhancements = []
         
         # Hook scenes: Add pattern interrupt
-        if 'hook' in scene_purpose.lower():
-            interrupts = self.pattern_interrupts.get(vertical, self.pattern_interrupts.get('auto_insurance'))
-            enhancements.append(f"Pattern interrupt: {random.choice(interrupts)}")
+        if 'hook' in purpose:
+            interrupts = self.pattern_interrupts.get(vertical, self._default_interrupts)
+            enhancements.append(f"Pattern interrupt: {self._choice(interrupts)}")
         
         # CTA scenes: Add urgency cues
-        if 'cta' in scene_purpose.lower():
+        if 'cta' in purpose:
             enhancements.append("Urgency: Leaning forward, pointing gesture toward CTA")
             enhancements.append("Social proof indicator: Subtle notification or counter in background")
         
-        # Add enhancements to prompt
-        if enhancements:
-            enhanced = prompt + "\n\nCONVERSION ELEMENTS:\n" + "\n".join(f"- {e}" for e in enhancements)
-            return enhanced
-        
-        return prompt
+        return enhancements
 
     def enhance_broll_prompt(self, prompt: str, scene_purpose: str) -> str:
         """
@@ -94,29 +122,29 @@ class ConversionOptimizer:
         Returns:
             Enhanced prompt with conversion visuals
         """
+        scene = {'purpose': scene_purpose, 'has_character': False}
+        return prompt + self._build_appendix(scene, {})
+
+    def _broll_enhancements(self, purpose: str) -> List[str]:
+        """Conversion storytelling lines for a B-roll scene (purpose lowercased)"""
         enhancements = []
         
         # Problem scenes: Show frustration/pain visually
-        if 'problem' in scene_purpose.lower():
+        if 'problem' in purpose:
             enhancements.append("Visual tension: Show before state with subtle distress cues")
             enhancements.append("Color: Desaturated, cooler tones emphasizing problem")
         
         # Solution scenes: Show transformation
-        if 'solution' in scene_purpose.lower():
+        if 'solution' in purpose:
             enhancements.append("Visual transformation: Transition from problem to solution state")
             enhancements.append("Color: Warm, saturated tones showing relief/success")
         
         # CTA scenes: Add urgency
-        if 'cta' in scene_purpose.lower():
-            urgency = random.choice(self.urgency_visuals['time_based'])
+        if 'cta' in purpose:
+            urgency = self._choice(self.urgency_visuals['time_based'])
             enhancements.append(f"Urgency visual: {urgency}")
         
-        # Add enhancements
-        if enhancements:
-            enhanced = prompt + "\n\nCONVERSION STORYTELLING:\n" + "\n".join(f"- {e}" for e in enhancements)
-            return enhanced
-        
-        return prompt
+        return enhancements
 
     def add_scroll_stopper(self, prompt: str, aggression_level: str) -> str:
         """
@@ -129,32 +157,14 @@ class ConversionOptimizer:
         Returns:
             Prompt with scroll-stopper element
         """
-        scroll_stoppers = {
-            'soft': [
-                'Unexpected moment of genuine surprise',
-                'Authentic spontaneous reaction'
-            ],
-            'medium': [
-                'Dramatic gesture emphasizing key point',
-                'Sudden reveal of important information'
-            ],
-            'aggressive': [
-                'Bold, attention-grabbing action',
-                'High-energy unexpected movement'
-            ],
-            'ultra': [
-                'Explosive reaction or reveal',
-                'Shocking visual contrast'
-            ]
-        }
-        
-        stoppers = scroll_stoppers.get(aggression_level, scroll_stoppers['medium'])
-        stopper = random.choice(stoppers)
-        
-        # Insert scroll-stopper into prompt
-        enhanced = prompt + f"\n\nSCROLL-STOPPER: {stopper} at key moment to break pattern"
+        return prompt + self._scroll_stopper_section(aggression_level)
+
+    def _scroll_stopper_section(self, aggression_level: str) -> str:
+        """Section add_scroll_stopper appends"""
+        stoppers = self.scroll_stoppers.get(aggression_level, self._default_stoppers)
+        stopper = self._choice(stoppers)
         
-        return enhanced
+        return f"\n\nSCROLL-STOPPER: {stopper} at key moment to break pattern"
 
     def optimize_prompt(self, prompt: str, scene: Dict, variant: Dict) -> str:
         """
@@ -168,23 +178,31 @@ class ConversionOptimizer:
         Returns:
             Fully optimized prompt
         """
+        return prompt + self._build_appendix(scene, variant)
+
+    def _build_appendix(self, scene: Dict, variant: Dict) -> str:
+        """Everything optimize_prompt appends to a base prompt ("" if nothing applies)"""
         # Get context
-        vertical = scene.get('vertical', 'default')
-        purpose = scene.get('purpose', '')
+        purpose = scene.get('purpose', '').lower()
         aggression = variant.get('variant_level', 'medium')
-        has_character = scene.get('has_character', True)
         
         # Enhance based on type
-        if has_character:
-            prompt = self.enhance_character_prompt(prompt, vertical, purpose)
+        if scene.get('has_character', True):
+            header = "CONVERSION ELEMENTS"
+            enhancements = self._character_enhancements(scene.get('vertical', 'default'), purpose)
         else:
-            prompt = self.enhance_broll_prompt(prompt, purpose)
+            header = "CONVERSION STORYTELLING"
+            enhancements = self._broll_enhancements(purpose)
+        
+        parts = []
+        if enhancements:
+            parts.append(f"\n\n{header}:\n" + "\n".join(f"- {e}" for e in enhancements))
         
         # Add scroll-stopper for aggressive variants
-        if aggression in ['aggressive', 'ultra']:
-            prompt = self.add_scroll_stopper(prompt, aggression)
+        if aggression in ('aggressive', 'ultra'):
+            parts.append(self._scroll_stopper_section(aggression))
         
-        return prompt
+        return "".join(parts)
 
 
 # Test function
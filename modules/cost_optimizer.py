@@ -7,11 +7,73 @@ Analyzes prompt complexity and recommends optimal model selection.
 
 import re
 import json
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+# Technical complexity indicators
+_TECHNICAL_TERMS = (
+    'cinematic', '4K', 'professional', 'commercial', 'high-end',
+    'dramatic', 'epic', 'sophisticated', 'premium', 'luxury',
+    'complex', 'intricate', 'detailed', 'precise', 'advanced'
+)
+
+# Visual complexity indicators
+_VISUAL_INDICATORS = (
+    'multiple characters', 'crowd', 'ensemble', 'group',
+    'complex lighting', 'dramatic shadows', 'cinematic lighting',
+    'special effects', 'visual effects', 'motion graphics',
+    'text overlays', 'animations', 'transitions'
+)
+
+# Camera work complexity
+_CAMERA_TERMS = (
+    'crane shot', 'dolly', 'tracking', 'steadicam', 'gimbal',
+    'complex movement', 'smooth motion', 'cinematic movement',
+    'dynamic', 'fluid', 'seamless'
+)
+
+# Each term found adds 1 to the complexity score (lowercased once at import)
+_COMPLEXITY_TERMS = tuple(
+    term.lower() for term in _TECHNICAL_TERMS + _VISUAL_INDICATORS + _CAMERA_TERMS
+)
+
+# Phrase groups that add their weight once if any phrase is present:
+# character consistency, audio, text overlays
+_COMPLEXITY_GROUPS = (
+    (('same character', 'consistent character'), 2),
+    (('audio', 'sound'), 1),
+    (('text overlay', 'text on screen'), 1),
+)
+
+
+@lru_cache(maxsize=4096)
+def _prompt_complexity(prompt: str) -> int:
+    """Complexity score (1-10) for a prompt; pure, so cached by prompt text"""
+    complexity_score = 0
+
+    # Length factor (longer prompts = more complex)
+    word_count = len(prompt.split())
+    if word_count > 200:
+        complexity_score += 3
+    elif word_count > 100:
+        complexity_score += 2
+    elif word_count > 50:
+        complexity_score += 1
+
+    # Every keyword check runs against one lowercased copy of the prompt
+    prompt_lower = prompt.lower()
+    complexity_score += sum(1 for term in _COMPLEXITY_TERMS if term in prompt_lower)
+    complexity_score += sum(
+        weight for phrases, weight in _COMPLEXITY_GROUPS
+        if any(phrase in prompt_lower for phrase in phrases)
+    )
+
+    return min(complexity_score, 10)  # Cap at 10
+
+
+@dataclass(frozen=True, slots=True)
 class CostAnalysis:
     """Cost analysis result"""
     recommended_model: str
@@ -46,6 +108,10 @@ class CostOptimizer:
             'high': 'sora-2-pro',
             'premium': 'sora-2-pro'
         }
+        
+        # Recommendations keyed by (prompt, quality_requirement); variants
+        # frequently reuse the same prompt across a batch
+        self._recommendation_cache: Dict[Tuple[str, str], CostAnalysis] = {}
     
     def analyze_prompt_complexity(self, prompt: str) -> int:
         """
@@ -53,64 +119,7 @@ class CostOptimizer:
         
         Higher scores indicate more complex prompts that benefit from Sora 2 Pro.
         """
-        complexity_score = 0
-        
-        # Length factor (longer prompts = more complex)
-        word_count = len(prompt.split())
-        if word_count > 200:
-            complexity_score += 3
-        elif word_count > 100:
-            complexity_score += 2
-        elif word_count > 50:
-            complexity_score += 1
-        
-        # Technical complexity indicators
-        technical_terms = [
-            'cinematic', '4K', 'professional', 'commercial', 'high-end',
-            'dramatic', 'epic', 'sophisticated', 'premium', 'luxury',
-            'complex', 'intricate', 'detailed', 'precise', 'advanced'
-        ]
-        
-        for term in technical_terms:
-            if term.lower() in prompt.lower():
-                complexity_score += 1
-        
-        # Visual complexity indicators
-        visual_indicators = [
-            'multiple characters', 'crowd', 'ensemble', 'group',
-            'complex lighting', 'dramatic shadows', 'cinematic lighting',
-            'special effects', 'visual effects', 'motion graphics',
-            'text overlays', 'animations', 'transitions'
-        ]
-        
-        for indicator in visual_indicators:
-            if indicator.lower() in prompt.lower():
-                complexity_score += 1
-        
-        # Camera work complexity
-        camera_terms = [
-            'crane shot', 'dolly', 'tracking', 'steadicam', 'gimbal',
-            'complex movement', 'smooth motion', 'cinematic movement',
-            'dynamic', 'fluid', 'seamless'
-        ]
-        
-        for term in camera_terms:
-            if term.lower() in prompt.lower():
-                complexity_score += 1
-        
-        # Character consistency requirements
-        if 'same character' in prompt.lower() or 'consistent character' in prompt.lower():
-            complexity_score += 2
-        
-        # Audio complexity
-        if 'audio' in prompt.lower() or 'sound' in prompt.lower():
-            complexity_score += 1
-        
-        # Text overlay complexity
-        if 'text overlay' in prompt.lower() or 'text on screen' in prompt.lower():
-            complexity_score += 1
-        
-        return min(complexity_score, 10)  # Cap at 10
+        return _prompt_complexity(prompt)
     
     def recommend_model(self, prompt: str, quality_requirement: str = 'standard') -> CostAnalysis:
         """
@@ -123,6 +132,16 @@ class CostOptimizer:
         Returns:
             CostAnalysis with recommendation and reasoning
         """
+        key = (prompt, quality_requirement)
+        cached = self._recommendation_cache.get(key)
+        if cached is None:
+            if len(self._recommendation_cache) >= 4096:
+                self._recommendation_cache.clear()
+            cached = self._recommendation_cache[key] = self._build_recommendation(prompt, quality_requirement)
+        return cached
+    
+    def _build_recommendation(self, prompt: str, quality_requirement: str) -> CostAnalysis:
+        """Uncached body of recommend_model"""
         complexity_score = self.analyze_prompt_complexity(prompt)
         
         # Base recommendation on complexity
@@ -187,24 +206,26 @@ class CostOptimizer:
             
             if model:
                 # Use specified model
+                scene_model = model
                 if model == 'sora-2':
                     scene_cost = duration * self.SORA_2_COST
                 else:
                     scene_cost = duration * self.SORA_2_PRO_COST
                 savings = 0
             else:
-                # Auto-select model
+                # Auto-select model per scene (must not overwrite `model`,
+                # or every later scene would skip the analysis)
                 analysis = self.recommend_model(prompt)
                 scene_cost = analysis.estimated_cost
                 savings = analysis.cost_savings
-                model = analysis.recommended_model
+                scene_model = analysis.recommended_model
             
             total_cost += scene_cost
             total_savings += savings
             
             cost_breakdown.append({
                 'scene': i + 1,
-                'model': model,
+                'model': scene_model,
                 'duration': duration,
                 'cost': scene_cost,
                 'savings': savings
@@ -224,40 +245,36 @@ class CostOptimizer:
         
         Groups similar scenes and recommends batch processing strategies.
         """
-        # Analyze each scene
-        analyses = []
-        for scene in scenes:
-            prompt = scene.get('prompt', '')
-            analysis = self.recommend_model(prompt)
-            analyses.append({
-                'scene': scene,
-                'analysis': analysis
-            })
+        # Analyze each scene in one pass, accumulating per-model counts and
+        # costs instead of materializing and re-filtering an analyses list
+        sora_2_count = sora_2_pro_count = 0
+        total_sora_2_cost = total_sora_2_pro_cost = 0
+        all_sora_2_pro_cost = 0
+        pro_rate = self.SORA_2_PRO_COST
         
-        # Group by recommended model
-        sora_2_scenes = [a for a in analyses if a['analysis'].recommended_model == 'sora-2']
-        sora_2_pro_scenes = [a for a in analyses if a['analysis'].recommended_model == 'sora-2-pro']
+        for scene in scenes:
+            analysis = self.recommend_model(scene.get('prompt', ''))
+            if analysis.recommended_model == 'sora-2':
+                sora_2_count += 1
+                total_sora_2_cost += analysis.estimated_cost
+            elif analysis.recommended_model == 'sora-2-pro':
+                sora_2_pro_count += 1
+                total_sora_2_pro_cost += analysis.estimated_cost
+            
+            # Potential cost if every scene used Sora 2 Pro
+            all_sora_2_pro_cost += scene.get('duration_seconds', 12) * pro_rate
         
-        # Calculate batch savings
-        total_sora_2_cost = sum(a['analysis'].estimated_cost for a in sora_2_scenes)
-        total_sora_2_pro_cost = sum(a['analysis'].estimated_cost for a in sora_2_pro_scenes)
         total_cost = total_sora_2_cost + total_sora_2_pro_cost
-        
-        # Calculate potential savings if all scenes used Sora 2 Pro
-        all_sora_2_pro_cost = sum(
-            scene.get('duration_seconds', 12) * self.SORA_2_PRO_COST 
-            for scene in scenes
-        )
         potential_savings = all_sora_2_pro_cost - total_cost
         
         return {
             'optimized_cost': total_cost,
             'potential_savings': potential_savings,
-            'sora_2_scenes': len(sora_2_scenes),
-            'sora_2_pro_scenes': len(sora_2_pro_scenes),
+            'sora_2_scenes': sora_2_count,
+            'sora_2_pro_scenes': sora_2_pro_count,
             'recommendations': [
-                f"Use Sora 2 for {len(sora_2_scenes)} simple scenes",
-                f"Use Sora 2 Pro for {len(sora_2_pro_scenes)} complex scenes",
+                f"Use Sora 2 for {sora_2_count} simple scenes",
+                f"Use Sora 2 Pro for {sora_2_pro_count} complex scenes",
                 f"Total savings: ${potential_savings:.2f} vs all Sora 2 Pro"
             ]
         }
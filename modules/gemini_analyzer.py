@@ -2,14 +2,50 @@
 Gemini 2.5 Video Analyzer
 Analyzes winning ads and extracts complete breakdown
 """
+import asyncio
 import json
+import mimetypes
+import os
+import re
+import tempfile
 import time
+import uuid
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
-import google.generativeai as genai
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import Config
 from modules.settings_manager import get_settings_manager
+from modules.persistence import dumps_json, loads_json
+
+# Status polling interval: starts short, grows by _POLL_BACKOFF per poll up to the cap
+_POLL_INITIAL_SECONDS = 0.5
+_POLL_BACKOFF = 1.5
+_POLL_MAX_SECONDS = 15.0
+
+# Markdown-fenced JSON in a Gemini response: a ```json fence wins over a bare
+# ``` fence; an unterminated fence runs to the end of the text
+_JSON_FENCE_RE = re.compile(r'```json(.*?)(?:```|$)', re.DOTALL)
+_FENCE_RE = re.compile(r'```(.*?)(?:```|$)', re.DOTALL)
+
+# Videos analyzed concurrently by analyze_and_save_many (matches the session pool size)
+_MAX_CONCURRENT_ANALYSES = 4
+
+
+@lru_cache(maxsize=None)
+def _get_genai():
+    """Import google.generativeai on first use; it is slow to import"""
+    import google.generativeai as genai
+    return genai
+
+
+@lru_cache(maxsize=32)
+def _mime_type_for_suffix(suffix: str) -> str:
+    """Upload MIME type for a file extension, defaulting to video/mp4"""
+    return mimetypes.guess_type(f"video{suffix}")[0] or 'video/mp4'
 
 
 class GeminiVideoAnalyzer:
@@ -18,11 +54,19 @@ class GeminiVideoAnalyzer:
     def __init__(self):
         """Initialize Gemini client"""
         # Disable discovery cache to prevent stale API schema errors
-        import os
         os.environ['GOOGLE_API_USE_CLIENT_CERTIFICATE'] = 'false'
 
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        self._genai = _get_genai()
+        self._genai.configure(api_key=Config.GEMINI_API_KEY)
+        self.model = self._genai.GenerativeModel(Config.GEMINI_MODEL)
+
+        # Reuse one pooled connection for the File API; idempotent requests
+        # (downloads, status checks) are retried on transient 5xx errors
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
 
     def upload_video(self, video_path: str):
         """
@@ -37,11 +81,6 @@ class GeminiVideoAnalyzer:
         print(f"Uploading video: {video_path}")
 
         # Use REST API directly to bypass discovery cache bug
-        import requests
-        import mimetypes
-        import tempfile
-        from pathlib import Path
-
         # Check if video_path is a URL
         is_url = video_path.startswith('http://') or video_path.startswith('https://')
         temp_file = None
@@ -49,7 +88,7 @@ class GeminiVideoAnalyzer:
         if is_url:
             # Download video to temporary file
             print(f"Downloading video from URL...")
-            response = requests.get(video_path, stream=True)
+            response = self._session.get(video_path, stream=True)
             response.raise_for_status()
 
             # Create temp file with proper extension
@@ -64,47 +103,45 @@ class GeminiVideoAnalyzer:
             video_path = temp_file.name
             print(f"Downloaded to temporary file: {video_path}")
 
-        # Get file info
-        file_path = Path(video_path)
-        mime_type = mimetypes.guess_type(video_path)[0] or 'video/mp4'
-        file_size = file_path.stat().st_size
-
-        # Upload using REST API
-        headers = {
-            'X-Goog-Upload-Protocol': 'resumable',
-            'X-Goog-Upload-Command': 'start',
-            'X-Goog-Upload-Header-Content-Length': str(file_size),
-            'X-Goog-Upload-Header-Content-Type': mime_type,
-            'Content-Type': 'application/json',
-        }
-
-        # Start upload session
-        start_url = f'https://generativelanguage.googleapis.com/upload/v1beta/files?key={Config.GEMINI_API_KEY}'
-        metadata = {
-            'file': {
-                'display_name': file_path.name
+        with open(video_path, 'rb') as f:
+            # Get file info from the handle the upload streams from
+            file_path = Path(video_path)
+            mime_type = _mime_type_for_suffix(file_path.suffix.lower())
+            file_size = os.fstat(f.fileno()).st_size
+
+            # Upload using REST API
+            headers = {
+                'X-Goog-Upload-Protocol': 'resumable',
+                'X-Goog-Upload-Command': 'start',
+                'X-Goog-Upload-Header-Content-Length': str(file_size),
+                'X-Goog-Upload-Header-Content-Type': mime_type,
+                'Content-Type': 'application/json',
             }
-        }
 
-        response = requests.post(start_url, headers=headers, json=metadata)
-        if response.status_code != 200:
-            raise ValueError(f"Upload start failed: {response.status_code} - {response.text}")
+            # Start upload session
+            start_url = f'https://generativelanguage.googleapis.com/upload/v1beta/files?key={Config.GEMINI_API_KEY}'
+            metadata = {
+                'file': {
+                    'display_name': file_path.name
+                }
+            }
 
-        upload_url = response.headers.get('X-Goog-Upload-URL')
-        if not upload_url:
-            raise ValueError("No upload URL returned")
+            response = self._session.post(start_url, headers=headers, json=metadata)
+            if response.status_code != 200:
+                raise ValueError(f"Upload start failed: {response.status_code} - {response.text}")
 
-        # Upload file content
-        with open(video_path, 'rb') as f:
-            file_data = f.read()
+            upload_url = response.headers.get('X-Goog-Upload-URL')
+            if not upload_url:
+                raise ValueError("No upload URL returned")
 
-        upload_headers = {
-            'Content-Length': str(file_size),
-            'X-Goog-Upload-Offset': '0',
-            'X-Goog-Upload-Command': 'upload, finalize',
-        }
+            # Upload file content, streamed from disk rather than read into memory
+            upload_headers = {
+                'Content-Length': str(file_size),
+                'X-Goog-Upload-Offset': '0',
+                'X-Goog-Upload-Command': 'upload, finalize',
+            }
 
-        upload_response = requests.post(upload_url, headers=upload_headers, data=file_data)
+            upload_response = self._session.post(upload_url, headers=upload_headers, data=f)
         if upload_response.status_code not in [200, 201]:
             raise ValueError(f"Upload failed: {upload_response.status_code} - {upload_response.text}")
 
@@ -113,10 +150,11 @@ class GeminiVideoAnalyzer:
 
         print(f"Upload complete: {file_name}")
 
-        # Wait for processing using REST API
+        # Wait for processing using REST API, backing off between polls
+        check_url = f'https://generativelanguage.googleapis.com/v1beta/{file_name}?key={Config.GEMINI_API_KEY}'
+        poll_seconds = _POLL_INITIAL_SECONDS
         while True:
-            check_url = f'https://generativelanguage.googleapis.com/v1beta/{file_name}?key={Config.GEMINI_API_KEY}'
-            check_response = requests.get(check_url)
+            check_response = self._session.get(check_url)
 
             if check_response.status_code != 200:
                 raise ValueError(f"Status check failed: {check_response.status_code}")
@@ -127,13 +165,14 @@ class GeminiVideoAnalyzer:
             if state == 'ACTIVE':
                 print(f"\nVideo ready: {file_data.get('uri')}")
                 # Convert to genai file object for compatibility
-                video_file = genai.get_file(file_name)
+                video_file = self._genai.get_file(file_name)
                 return video_file
             elif state == 'FAILED':
                 raise ValueError(f"Video processing failed")
             else:
                 print(".", end="", flush=True)
-                time.sleep(2)
+                time.sleep(poll_seconds)
+                poll_seconds = min(poll_seconds * _POLL_BACKOFF, _POLL_MAX_SECONDS)
 
     def analyze_video(self, video_path: str) -> Dict:
         """
@@ -164,7 +203,7 @@ class GeminiVideoAnalyzer:
         print("Analyzing video with Gemini 2.5...")
         response = self.model.generate_content(
             [video_file, prompt],
-            generation_config=genai.GenerationConfig(
+            generation_config=self._genai.GenerationConfig(
                 temperature=0.2,  # Low temperature for consistency
             )
         )
@@ -177,16 +216,11 @@ class GeminiVideoAnalyzer:
             response_text = response.text
 
             # Find JSON in response (might be wrapped in markdown)
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end]
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end]
+            match = _JSON_FENCE_RE.search(response_text) or _FENCE_RE.search(response_text)
+            if match:
+                response_text = match.group(1)
 
-            analysis = json.loads(response_text.strip())
+            analysis = loads_json(response_text.strip())
 
         except json.JSONDecodeError as e:
             print(f"Failed to parse JSON, saving raw response")
@@ -320,14 +354,15 @@ class GeminiVideoAnalyzer:
             Path to saved file
         """
         if output_path is None:
+            # Concurrent saves (analyze_and_save_many) can share a timestamp,
+            # so add a random suffix to keep their files apart
             timestamp = time.strftime("%Y%m%d_%H%M%S")
-            output_path = Config.ANALYSIS_DIR / f"analysis_{timestamp}.json"
+            output_path = Config.ANALYSIS_DIR / f"analysis_{timestamp}_{uuid.uuid4().hex[:8]}.json"
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        output_path.write_bytes(dumps_json(analysis))
 
         print(f"Analysis saved to: {output_path}")
         return str(output_path)
@@ -343,6 +378,43 @@ class GeminiVideoAnalyzer:
         save_path = self.save_analysis(analysis)
         return analysis, save_path
 
+    async def analyze_and_save_async(self, video_path: str) -> tuple[Dict, str]:
+        """
+        analyze_and_save on a worker thread, so uploads, status polling and
+        Gemini calls for several videos can overlap
+
+        Returns:
+            Tuple of (analysis dict, save path)
+        """
+        return await asyncio.to_thread(self.analyze_and_save, video_path)
+
+    async def analyze_and_save_many_async(self, video_paths: List[str]) -> List[tuple[Dict, str]]:
+        """
+        Analyze and save several videos concurrently
+
+        Args:
+            video_paths: Paths or URLs of the videos
+
+        Returns:
+            List of (analysis dict, save path) tuples, in input order
+        """
+        limit = asyncio.Semaphore(_MAX_CONCURRENT_ANALYSES)
+
+        async def run_one(video_path: str) -> tuple[Dict, str]:
+            async with limit:
+                return await self.analyze_and_save_async(video_path)
+
+        return await asyncio.gather(*(run_one(path) for path in video_paths))
+
+    def analyze_and_save_many(self, video_paths: List[str]) -> List[tuple[Dict, str]]:
+        """
+        Blocking wrapper around analyze_and_save_many_async
+
+        Returns:
+            List of (analysis dict, save path) tuples, in input order
+        """
+        return asyncio.run(self.analyze_and_save_many_async(video_paths))
+
 
 # Test function
 if __name__ == "__main__":
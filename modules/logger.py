@@ -2,15 +2,27 @@
 Detailed Logging System
 Provides comprehensive logging with progress tracking and status updates
 """
+import atexit
+import bisect
+import functools
 import logging
 import json
+import queue
+import threading
 import time
+import weakref
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 from datetime import datetime
 from enum import Enum
 
 from config import Config
+from modules.persistence import dumps_json, save_json
+
+# Minimum seconds between progress.json rewrites; updates in between are
+# coalesced into one trailing write
+_PROGRESS_FLUSH_INTERVAL = 0.25
 
 
 class LogLevel(Enum):
@@ -24,6 +36,70 @@ class LogLevel(Enum):
     VERBOSE = "VERBOSE"  # Extra detailed logging
 
 
+# Console prefix per level
+_LEVEL_EMOJI = {
+    LogLevel.SUCCESS: "✓",
+    LogLevel.ERROR: "✗",
+    LogLevel.WARNING: "⚠",
+    LogLevel.INFO: "ℹ",
+    LogLevel.PROGRESS: "→",
+    LogLevel.DEBUG: "·",
+    LogLevel.VERBOSE: "▸"
+}
+
+# stdlib logging level for the file logger; anything unlisted logs as INFO
+_LEVEL_TO_LOGGING = {
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.DEBUG: logging.DEBUG
+}
+
+
+# Scene progress must move by at least this many points to be persisted
+# (status or job changes are always persisted)
+_SCENE_PROGRESS_SAVE_STEP = 5
+
+# Levels whose data payload is echoed to the console
+_CONSOLE_DATA_LEVELS = frozenset((LogLevel.ERROR, LogLevel.WARNING, LogLevel.VERBOSE))
+
+# Identical console lines within this many seconds are printed once
+_CONSOLE_DEDUPE_WINDOW = 5.0
+
+
+# Reused encoders for file-log data and console data blocks
+_JSON_COMPACT = json.JSONEncoder(default=str)
+_JSON_PRETTY = json.JSONEncoder(indent=2, default=str)
+
+
+def _close_at_exit(logger_ref: 'weakref.ref[PipelineLogger]'):
+    """atexit hook: close a logger that is still alive and was never closed"""
+    logger = logger_ref()
+    if logger is not None:
+        logger.close()
+
+
+def _release_file_logging(listener: QueueListener, file_logger: logging.Logger,
+                          queue_handler: QueueHandler, file_handler: logging.Handler,
+                          events_fp):
+    """Stop a session's log listener thread and close its files"""
+    listener.stop()
+    file_logger.removeHandler(queue_handler)
+    file_handler.close()
+    events_fp.close()
+
+
+class _LazyJson:
+    """Defers json.dumps of log data until a handler actually formats the record"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Dict):
+        self.data = data
+
+    def __str__(self) -> str:
+        return _JSON_COMPACT.encode(self.data)
+
+
 class PipelineLogger:
     """Comprehensive pipeline logging with progress tracking"""
 
@@ -39,7 +115,7 @@ class PipelineLogger:
         # Log files
         self.main_log = self.log_dir / "pipeline.log"
         self.progress_log = self.log_dir / "progress.json"
-        self.events_log = self.log_dir / "events.json"
+        self.events_log = self.log_dir / "events.jsonl"
 
         # Initialize progress tracking
         self.progress = {
@@ -59,19 +135,56 @@ class PipelineLogger:
             'completed_at': None
         }
 
-        # Event log
+        # Progress snapshot write coalescing (see _save_progress); also held
+        # by every method that mutates self.progress
+        self._progress_lock = threading.Lock()
+        self._progress_dirty = False
+        self._progress_flushed_at = 0.0
+        self._progress_timer: Optional[threading.Timer] = None
+
+        # Scene progress value at its last save, keyed by (variant, scene)
+        self._scene_saved_progress: Dict[tuple, int] = {}
+
+        # Console dedupe state: (level, message) -> [last printed, repeats skipped]
+        self._console_seen: Dict[tuple, list] = {}
+        self._console_lock = threading.Lock()
+
+        # Event log: kept in memory and appended to events.jsonl one line per
+        # event (unbuffered, so readers see each event as it is logged)
         self.events = []
+        self._event_timestamps = []  # parallel to events; ISO strings sort chronologically
+        # Held while stamping and appending an event, so events stay in
+        # timestamp order when several threads log at once
+        self._events_lock = threading.Lock()
+        self._events_fp = open(self.events_log, 'ab', buffering=0)
 
         # Setup file logger
         self._setup_file_logger()
 
+        # Release the listener thread and files when the logger is collected
+        # without being closed; neither hook keeps the logger alive
+        self._release = weakref.finalize(
+            self, _release_file_logging, self._log_listener, self.file_logger,
+            self._queue_handler, self._file_handler, self._events_fp
+        )
+
+        # Flush and release everything on interpreter exit if not closed first
+        self._closed = False
+        self._atexit_hook = functools.partial(_close_at_exit, weakref.ref(self))
+        atexit.register(self._atexit_hook)
+
         self.log(LogLevel.INFO, "Pipeline session started", {
             'session_id': self.session_id,
             'log_dir': str(self.log_dir)
         })
 
     def _setup_file_logger(self):
-        """Setup file-based logging"""
+        """
+        Setup file-based logging
+
+        Records are handed to a queue and written to pipeline.log by a
+        background listener thread, so log() never waits on disk I/O.
+        """
         self.file_logger = logging.getLogger(f'pipeline_{self.session_id}')
         self.file_logger.setLevel(logging.DEBUG)
 
@@ -84,7 +197,13 @@ class PipelineLogger:
         )
         handler.setFormatter(formatter)
 
-        self.file_logger.addHandler(handler)
+        self._file_handler = handler
+        self._log_queue = queue.Queue()
+        self._queue_handler = QueueHandler(self._log_queue)
+        self.file_logger.addHandler(self._queue_handler)
+
+        self._log_listener = QueueListener(self._log_queue, handler, respect_handler_level=True)
+        self._log_listener.start()
 
     def log(self, level: LogLevel, message: str, data: Optional[Dict] = None):
         """
@@ -95,49 +214,75 @@ class PipelineLogger:
             message: Log message
             data: Optional additional data
         """
-        timestamp = datetime.now().isoformat()
-
-        # Create event
-        event = {
-            'timestamp': timestamp,
-            'level': level.value,
-            'message': message,
-            'data': data or {}
-        }
+        with self._events_lock:
+            timestamp = datetime.now().isoformat()
+
+            # Create event
+            event = {
+                'timestamp': timestamp,
+                'level': level.value,
+                'message': message,
+                'data': data or {}
+            }
 
-        self.events.append(event)
+            self.events.append(event)
+            self._event_timestamps.append(timestamp)
+            self._append_event(event)
 
-        # Write to file logger
-        log_msg = f"{message}"
+        # Write to file logger (data is only serialized if the record is emitted)
         if data:
-            log_msg += f" | {json.dumps(data)}"
-
-        if level == LogLevel.ERROR:
-            self.file_logger.error(log_msg)
-        elif level == LogLevel.WARNING:
-            self.file_logger.warning(log_msg)
-        elif level == LogLevel.DEBUG:
-            self.file_logger.debug(log_msg)
+            log_args = ("%s | %s", message, _LazyJson(data))
         else:
-            self.file_logger.info(log_msg)
+            log_args = ("%s", message)
+
+        self.file_logger.log(_LEVEL_TO_LOGGING.get(level, logging.INFO), *log_args)
 
         # Console output
-        emoji = {
-            LogLevel.SUCCESS: "✓",
-            LogLevel.ERROR: "✗",
-            LogLevel.WARNING: "⚠",
-            LogLevel.INFO: "ℹ",
-            LogLevel.PROGRESS: "→",
-            LogLevel.DEBUG: "·",
-            LogLevel.VERBOSE: "▸"
-        }.get(level, "•")
-
-        print(f"{emoji} {message}")
-        if data and level in [LogLevel.ERROR, LogLevel.WARNING, LogLevel.VERBOSE]:
-            print(f"  {json.dumps(data, indent=2)}")
-
-        # Save events
-        self._save_events()
+        self._print_console(level, message, data)
+
+    def _print_console(self, level: LogLevel, message: str, data: Optional[Dict]):
+        """
+        Print an event to the console, suppressing identical repeats
+
+        The same (level, message) is printed at most once per
+        _CONSOLE_DEDUPE_WINDOW; the next print after a quiet window reports
+        how many repeats were skipped.
+        """
+        now = time.monotonic()
+        key = (level, message)
+        with self._console_lock:
+            entry = self._console_seen.get(key)
+            if entry is not None and now - entry[0] < _CONSOLE_DEDUPE_WINDOW:
+                entry[1] += 1
+                return
+
+            if len(self._console_seen) >= 1024:
+                # Forget messages outside the window so the table stays small
+                self._flush_console_repeats(now)
+                self._console_seen = {
+                    k: v for k, v in self._console_seen.items()
+                    if now - v[0] < _CONSOLE_DEDUPE_WINDOW
+                }
+            self._console_seen[key] = [now, 0]
+
+        line = f"{_LEVEL_EMOJI.get(level, '•')} {message}"
+        if entry is not None and entry[1]:
+            line += f" (repeated {entry[1]}x)"
+        if data and level in _CONSOLE_DATA_LEVELS:
+            line += f"\n  {_JSON_PRETTY.encode(data)}"
+        print(line)
+
+    def _flush_console_repeats(self, now: Optional[float] = None):
+        """
+        Print repeat counts that no later message will report
+
+        With now, only messages whose dedupe window has ended are reported;
+        without it, every pending count is. Caller holds _console_lock.
+        """
+        for (level, message), entry in self._console_seen.items():
+            if entry[1] and (now is None or now - entry[0] >= _CONSOLE_DEDUPE_WINDOW):
+                print(f"{_LEVEL_EMOJI.get(level, '•')} {message} (repeated {entry[1]}x)")
+                entry[1] = 0
 
     def start_stage(self, stage_name: str, total_items: Optional[int] = None):
         """
@@ -147,13 +292,14 @@ class PipelineLogger:
             stage_name: Name of stage (analysis, variants, prompts, generation, assembly)
             total_items: Optional total items for progress tracking
         """
-        self.progress['current_stage'] = stage_name
-        self.progress['stages'][stage_name]['status'] = 'in_progress'
-        self.progress['stages'][stage_name]['started_at'] = datetime.now().isoformat()
-        self.progress['stages'][stage_name]['progress'] = 0
+        with self._progress_lock:
+            self.progress['current_stage'] = stage_name
+            self.progress['stages'][stage_name]['status'] = 'in_progress'
+            self.progress['stages'][stage_name]['started_at'] = datetime.now().isoformat()
+            self.progress['stages'][stage_name]['progress'] = 0
 
-        if total_items:
-            self.progress['stages'][stage_name]['total_items'] = total_items
+            if total_items:
+                self.progress['stages'][stage_name]['total_items'] = total_items
 
         self.log(LogLevel.INFO, f"Stage started: {stage_name}", {
             'stage': stage_name,
@@ -171,7 +317,8 @@ class PipelineLogger:
             progress: Progress percentage (0-100)
             message: Optional progress message
         """
-        self.progress['stages'][stage_name]['progress'] = progress
+        with self._progress_lock:
+            self.progress['stages'][stage_name]['progress'] = progress
 
         data = {
             'stage': stage_name,
@@ -192,12 +339,13 @@ class PipelineLogger:
             stage_name: Stage name
             result: Optional result data
         """
-        self.progress['stages'][stage_name]['status'] = 'completed'
-        self.progress['stages'][stage_name]['progress'] = 100
-        self.progress['stages'][stage_name]['completed_at'] = datetime.now().isoformat()
+        with self._progress_lock:
+            self.progress['stages'][stage_name]['status'] = 'completed'
+            self.progress['stages'][stage_name]['progress'] = 100
+            self.progress['stages'][stage_name]['completed_at'] = datetime.now().isoformat()
 
-        if result:
-            self.progress['stages'][stage_name]['result'] = result
+            if result:
+                self.progress['stages'][stage_name]['result'] = result
 
         self.log(LogLevel.SUCCESS, f"Stage completed: {stage_name}", result)
         self._save_progress()
@@ -210,13 +358,14 @@ class PipelineLogger:
             stage_name: Stage name
             error: Error message
         """
-        self.progress['stages'][stage_name]['status'] = 'failed'
-        self.progress['stages'][stage_name]['error'] = error
-        self.progress['errors'].append({
-            'stage': stage_name,
-            'error': error,
-            'timestamp': datetime.now().isoformat()
-        })
+        with self._progress_lock:
+            self.progress['stages'][stage_name]['status'] = 'failed'
+            self.progress['stages'][stage_name]['error'] = error
+            self.progress['errors'].append({
+                'stage': stage_name,
+                'error': error,
+                'timestamp': datetime.now().isoformat()
+            })
 
         self.log(LogLevel.ERROR, f"Stage failed: {stage_name}", {'error': error})
         self._save_progress()
@@ -230,20 +379,25 @@ class PipelineLogger:
             status: Status (generating, completed, failed)
             data: Optional data
         """
-        if variant_name not in self.progress['variants']:
-            self.progress['variants'][variant_name] = {
-                'status': status,
-                'started_at': datetime.now().isoformat(),
-                'scenes': {}
-            }
-        else:
-            self.progress['variants'][variant_name]['status'] = status
-
-        if data:
-            self.progress['variants'][variant_name].update(data)
-
-        if status == 'completed':
-            self.progress['variants'][variant_name]['completed_at'] = datetime.now().isoformat()
+        with self._progress_lock:
+            # Timestamp taken at most once, and only if a field needs it
+            now = None
+            variant = self.progress['variants'].get(variant_name)
+            if variant is None:
+                now = datetime.now().isoformat()
+                variant = self.progress['variants'][variant_name] = {
+                    'status': status,
+                    'started_at': now,
+                    'scenes': {}
+                }
+            else:
+                variant['status'] = status
+
+            if data:
+                variant.update(data)
+
+            if status == 'completed':
+                variant['completed_at'] = now or datetime.now().isoformat()
 
         self.log(LogLevel.INFO, f"Variant {variant_name}: {status}", data)
         self._save_progress()
@@ -260,29 +414,47 @@ class PipelineLogger:
             progress: Optional progress percentage
             job_id: Optional Sora job ID
         """
-        if variant_name not in self.progress['variants']:
-            self.progress['variants'][variant_name] = {'scenes': {}}
-
-        scene_key = f"scene_{scene_number}"
-
-        if scene_key not in self.progress['variants'][variant_name]['scenes']:
-            self.progress['variants'][variant_name]['scenes'][scene_key] = {
-                'status': status,
-                'started_at': datetime.now().isoformat()
-            }
-        else:
-            self.progress['variants'][variant_name]['scenes'][scene_key]['status'] = status
-
-        if progress is not None:
-            self.progress['variants'][variant_name]['scenes'][scene_key]['progress'] = progress
-
-        if job_id:
-            self.progress['variants'][variant_name]['scenes'][scene_key]['job_id'] = job_id
-
-        if status == 'completed':
-            self.progress['variants'][variant_name]['scenes'][scene_key]['completed_at'] = datetime.now().isoformat()
-
-        self._save_progress()
+        with self._progress_lock:
+            if variant_name not in self.progress['variants']:
+                self.progress['variants'][variant_name] = {'scenes': {}}
+
+            scenes = self.progress['variants'][variant_name]['scenes']
+            scene_key = f"scene_{scene_number}"
+
+            # Timestamp taken at most once, and only if a field needs it
+            now = None
+            scene = scenes.get(scene_key)
+            if scene is None:
+                now = datetime.now().isoformat()
+                scene = scenes[scene_key] = {
+                    'status': status,
+                    'started_at': now
+                }
+                changed = True
+            else:
+                changed = scene['status'] != status
+                scene['status'] = status
+
+            if progress is not None:
+                scene['progress'] = progress
+
+            if job_id:
+                changed = changed or scene.get('job_id') != job_id
+                scene['job_id'] = job_id
+
+            if status == 'completed':
+                scene['completed_at'] = now or datetime.now().isoformat()
+
+            # Small progress ticks update memory but only trigger a save once
+            # they add up to _SCENE_PROGRESS_SAVE_STEP since the last save
+            saved_key = (variant_name, scene_key)
+            current = scene.get('progress', 0)
+            save = changed or abs(current - self._scene_saved_progress.get(saved_key, 0)) >= _SCENE_PROGRESS_SAVE_STEP
+            if save:
+                self._scene_saved_progress[saved_key] = current
+
+        if save:
+            self._save_progress()
 
     def complete_pipeline(self, final_results: Dict):
         """
@@ -291,12 +463,12 @@ class PipelineLogger:
         Args:
             final_results: Final results dictionary
         """
-        self.progress['status'] = 'completed'
-        self.progress['completed_at'] = datetime.now().isoformat()
-        self.progress['final_results'] = final_results
-
         elapsed = time.time() - self.session_start
-        self.progress['elapsed_time'] = elapsed
+        with self._progress_lock:
+            self.progress['status'] = 'completed'
+            self.progress['completed_at'] = datetime.now().isoformat()
+            self.progress['final_results'] = final_results
+            self.progress['elapsed_time'] = elapsed
 
         self.log(LogLevel.SUCCESS, "Pipeline completed", {
             'elapsed_time': f"{elapsed/60:.1f} minutes",
@@ -304,22 +476,87 @@ class PipelineLogger:
         })
 
         self._save_progress()
+        self.flush_progress()
 
     def _save_progress(self):
-        """Save progress to JSON file"""
-        with open(self.progress_log, 'w') as f:
-            json.dump(self.progress, f, indent=2)
+        """
+        Save progress to JSON file
+
+        Writes at most once per _PROGRESS_FLUSH_INTERVAL; changes made in
+        between are picked up by a single trailing write from a timer.
+        """
+        with self._progress_lock:
+            self._progress_dirty = True
+            wait = self._progress_flushed_at + _PROGRESS_FLUSH_INTERVAL - time.monotonic()
+            if wait > 0:
+                if self._progress_timer is None:
+                    self._progress_timer = threading.Timer(wait, self.flush_progress)
+                    self._progress_timer.daemon = True
+                    self._progress_timer.start()
+                return
+
+        self.flush_progress()
+
+    def flush_progress(self):
+        """
+        Write the progress snapshot now if it has unsaved changes
+
+        Also reports console repeats whose dedupe window has ended.
+        """
+        with self._console_lock:
+            self._flush_console_repeats(time.monotonic())
+
+        with self._progress_lock:
+            if self._progress_timer is not None:
+                self._progress_timer.cancel()
+                self._progress_timer = None
+
+            if not self._progress_dirty:
+                return
+
+            # Writers mutate progress under this lock too, so the snapshot
+            # is serialized without the dict changing underneath it; a
+            # failed write leaves it dirty for the next flush
+            self._progress_flushed_at = time.monotonic()
+            save_json(self.progress, self.progress_log, ensure_dir=False)
+            self._progress_dirty = False
+
+    def _append_event(self, event: Dict):
+        """Append one event to the JSONL event log"""
+        if self._events_fp.closed:
+            return
+        self._events_fp.write(dumps_json(event, indent=None) + b"\n")
+
+    def close(self):
+        """
+        Flush pending output and release the session's files
+
+        Writes any coalesced progress snapshot, drains queued file-log records,
+        detaches and closes the file handler, and closes the event log.
+        Safe to call more than once; also runs at interpreter exit.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self._atexit_hook)
+
+        self.flush_progress()
+        with self._console_lock:
+            self._flush_console_repeats()
+        self._release()
+
+    def __enter__(self) -> 'PipelineLogger':
+        return self
 
-    def _save_events(self):
-        """Save events to JSON file"""
-        with open(self.events_log, 'w') as f:
-            json.dump(self.events, f, indent=2)
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def get_progress(self) -> Dict:
         """Get current progress"""
-        return self.progress.copy()
+        with self._progress_lock:
+            return dict(self.progress)
 
-    def get_events(self, since: Optional[str] = None) -> List[Dict]:
+    def get_events(self, since: Optional[str] = None) -> Sequence[Dict]:
         """
         Get events, optionally filtered by timestamp
 
@@ -327,11 +564,13 @@ class PipelineLogger:
             since: ISO timestamp to filter events after
 
         Returns:
-            List of events
+            Tuple of events
         """
-        if since:
-            return [e for e in self.events if e['timestamp'] > since]
-        return self.events.copy()
+        with self._events_lock:
+            if since:
+                # Events are appended in time order, so binary-search the start
+                return tuple(self.events[bisect.bisect_right(self._event_timestamps, since):])
+            return tuple(self.events)
 
 
 # Global logger instance
@@ -342,6 +581,8 @@ def get_logger(session_id: Optional[str] = None) -> PipelineLogger:
     """Get or create global logger instance"""
     global _current_logger
     if _current_logger is None or session_id:
+        if _current_logger is not None:
+            _current_logger.close()
         _current_logger = PipelineLogger(session_id)
     return _current_logger
 
@@ -3,15 +3,112 @@ Unified JSON persistence layer
 Consolidates 29 duplicate JSON operations across modules
 """
 import json
+import mmap
+import os
+import shutil
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+# Directories this process has already created or confirmed, so repeated
+# saves into the same directory skip the mkdir syscall
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    """mkdir -p, once per directory per process"""
+    if directory not in _ENSURED_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+
+def _write_in_dir(directory: Path, ensure_dir: bool, write):
+    """
+    Run write(), recreating a cached directory that has since been removed
+
+    _ensure_dir() skips the mkdir for directories it has seen, so if one is
+    deleted later (session cleanup, output pruning) the write fails with
+    FileNotFoundError; forget it, recreate it and retry once.
+    """
+    try:
+        return write()
+    except FileNotFoundError:
+        if not ensure_dir:
+            raise
+        _ENSURED_DIRS.discard(directory)
+        _ensure_dir(directory)
+        return write()
+
+
+# Reused stdlib encoders for the no-orjson path (json.dumps with default=
+# builds a fresh JSONEncoder on every call)
+_JSON_PRETTY = json.JSONEncoder(indent=2, default=str)
+_JSON_COMPACT = json.JSONEncoder(default=str)
+
+
+def dumps_json(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes
+
+    Uses orjson when available (a C encoder, several times faster than the
+    stdlib on nested analysis dicts) and falls back to json otherwise.
+    Values that aren't JSON-serializable are written as str().
+
+    Args:
+        data: Data to serialize
+        indent: Indentation level (orjson only supports 2 or None)
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None and indent in (None, 2):
+        # Datetimes go through default=str like the stdlib path, so both
+        # backends write the same timestamp format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=str)
+    if indent is None:
+        return _JSON_COMPACT.encode(data).encode()
+    if indent == 2:
+        return _JSON_PRETTY.encode(data).encode()
+    return json.dumps(data, indent=indent, default=str).encode()
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when available
+
+    Args:
+        data: JSON text or UTF-8 bytes
+
+    Returns:
+        Decoded data
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error
+            type subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def save_json(data: Any, file_path: str, indent: int = 2, ensure_dir: bool = True) -> None:
     """
     Save data to JSON file
 
+    The document is written to a temporary sibling file and renamed over
+    the target, so concurrent readers never see a partially written file.
+
     Args:
         data: Data to save (dict, list, etc.)
         file_path: Path to JSON file
@@ -24,10 +121,22 @@ def save_json(data: Any, file_path: str, indent: int = 2, ensure_dir: bool = Tru
     path = Path(file_path)
 
     if ensure_dir:
-        path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(path.parent)
+
+    # Temp name is unique per process and thread, so concurrent writers of
+    # the same file never clobber each other's partial output
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    blob = dumps_json(data, indent=indent)
 
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=indent, default=str)
+    def write():
+        try:
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    _write_in_dir(path.parent, ensure_dir, write)
 
 
 def load_json(file_path: str, default: Optional[Any] = None) -> Any:
@@ -47,17 +156,83 @@ def load_json(file_path: str, default: Optional[Any] = None) -> Any:
         return default
 
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            # orjson parses straight from a read-only mapping of the file, so
+            # no separate bytes copy of a large document is held in memory
+            if orjson is not None and os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return loads_json(f.read())
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"⚠ Failed to load {file_path}: {e}")
+        return default
+
+
+def load_jsonl(file_path: str, default: Optional[Any] = None) -> Any:
+    """
+    Load records from a JSON Lines file (one JSON document per line)
+
+    A trailing line without a newline is treated as a record still being
+    written and is skipped, so files that are appended to while being read
+    load cleanly.
+
+    Args:
+        file_path: Path to JSONL file
+        default: Default value if file doesn't exist or is invalid
+
+    Returns:
+        List of records or default value
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        return default
+
+    try:
+        lines = path.read_bytes().split(b'\n')
+        return [loads_json(line) for line in lines[:-1] if line.strip()]
     except (json.JSONDecodeError, IOError) as e:
         print(f"⚠ Failed to load {file_path}: {e}")
         return default
 
 
+def append_jsonl(item: Any, file_path: str, ensure_dir: bool = True) -> None:
+    """
+    Append one record to a JSON Lines file (creates if doesn't exist)
+
+    The record and its newline go out in a single O_APPEND write, so the
+    cost is independent of file size and concurrent appenders don't
+    interleave within a line.
+
+    Args:
+        item: Record to append
+        file_path: Path to JSONL file
+        ensure_dir: Create parent directories if they don't exist
+    """
+    path = Path(file_path)
+
+    if ensure_dir:
+        _ensure_dir(path.parent)
+
+    line = dumps_json(item, indent=None) + b'\n'
+
+    def write():
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    _write_in_dir(path.parent, ensure_dir, write)
+
+
 def append_to_json_array(item: Any, file_path: str, ensure_dir: bool = True) -> None:
     """
     Append item to JSON array file (creates if doesn't exist)
 
+    This rewrites the whole array on every call; for append-heavy data
+    prefer append_jsonl/load_jsonl.
+
     Args:
         item: Item to append
         file_path: Path to JSON array file
@@ -128,42 +303,63 @@ def backup_json(file_path: str, backup_dir: Optional[str] = None) -> str:
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_file = backup_path / f"{path.stem}_{timestamp}.json"
 
-    # Copy file
-    data = load_json(file_path)
-    save_json(data, str(backup_file))
+    # Copy file bytes directly (no parse/re-encode; copy_file_range/sendfile where available)
+    shutil.copyfile(path, backup_file)
 
     return str(backup_file)
 
 
 class JSONCache:
-    """Simple file-based JSON cache"""
+    """
+    Simple JSON cache backed by a single SQLite file
+
+    Values are stored as JSON blobs in ``<cache_dir>/cache.db`` (WAL mode),
+    so each operation is one indexed statement instead of a file per key.
+    """
 
     def __init__(self, cache_dir: str = '.cache'):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.cache_dir / 'cache.db'),
+            isolation_level=None,  # autocommit; each statement is its own transaction
+            check_same_thread=False
+        )
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+
     def get(self, key: str, default: Optional[Any] = None) -> Any:
         """Get cached value"""
-        cache_file = self.cache_dir / f"{key}.json"
-        return load_json(str(cache_file), default=default)
+        with self._lock:
+            row = self._db.execute('SELECT value FROM kv WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        try:
+            return loads_json(row[0])
+        except json.JSONDecodeError as e:
+            print(f"⚠ Failed to load cache entry {key}: {e}")
+            return default
 
     def set(self, key: str, value: Any) -> None:
         """Set cached value"""
-        cache_file = self.cache_dir / f"{key}.json"
-        save_json(value, str(cache_file))
+        blob = dumps_json(value, indent=None)
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)', (key, blob))
 
     def delete(self, key: str) -> bool:
         """Delete cached value"""
-        cache_file = self.cache_dir / f"{key}.json"
-        if cache_file.exists():
-            cache_file.unlink()
-            return True
-        return False
+        with self._lock:
+            return self._db.execute('DELETE FROM kv WHERE key = ?', (key,)).rowcount > 0
 
     def clear(self) -> int:
         """Clear all cached values"""
-        count = 0
-        for cache_file in self.cache_dir.glob('*.json'):
-            cache_file.unlink()
-            count += 1
-        return count
+        with self._lock:
+            return self._db.execute('DELETE FROM kv').rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._db.close()
@@ -37,9 +37,34 @@ class PromptValidator:
         'spokesperson', 'actor', 'he ', 'she ', 'human', 'individual'
     ]
 
+    # Every emotion in CONTRADICTORY_EMOTIONS, matched at word starts
+    # ("calmly", "urgently" still count) in one pass
+    _RE_EMOTIONS = re.compile(
+        r'\b(' + '|'.join(sorted({e for pair in CONTRADICTORY_EMOTIONS for e in pair})) + ')'
+    )
+
+    # All BROLL_FORBIDDEN terms as whole words (plurals included) in one pass
+    _RE_BROLL_FORBIDDEN = re.compile(
+        r'\b(' + '|'.join(re.escape(word.strip()) for word in BROLL_FORBIDDEN) + r')s?\b',
+        re.IGNORECASE
+    )
+
+    # Precompiled patterns for the Sora 2 Pro checks
+    _RE_TEXT_AT = re.compile(r'at (\d+):(\d+)', re.IGNORECASE)
+    # Every 'at/from/start m:ss' cue in one scan, shared by the text and audio checks
+    _RE_TIMINGS = re.compile(r'(at|from|start) (\d+):(\d+)', re.IGNORECASE)
+
+    # Jarring transitions, matched against the lowercased prompt
+    _JARRING_TRANSITIONS = (
+        (re.compile(r'extreme close-up.*extreme close-up'), 'Two extreme close-ups in sequence'),
+        (re.compile(r'whip pan.*whip pan'), 'Multiple whip pans in sequence'),
+        (re.compile(r'crash zoom.*crash zoom'), 'Multiple crash zooms in sequence')
+    )
+
     def __init__(self):
-        self.warnings = []
-        self.errors = []
+        # Results keyed by (prompt, has_character): re-validating an unchanged
+        # prompt during prompt iteration skips every scan
+        self._result_cache: Dict[Tuple[str, bool], Tuple[bool, Tuple[str, ...], Tuple[str, ...]]] = {}
 
     def validate_prompt(self, prompt: str, scene_info: Dict) -> Tuple[bool, List[str], List[str]]:
         """
@@ -52,175 +77,224 @@ class PromptValidator:
         Returns:
             Tuple of (is_valid, warnings, errors)
         """
-        self.warnings = []
-        self.errors = []
+        has_character = bool(scene_info.get('has_character', True))
+        key = (prompt, has_character)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            is_valid, warnings, errors = cached
+            return is_valid, list(warnings), list(errors)
+        
+        # Checks append to these local lists, so one validator can be
+        # shared between threads
+        warnings = []
+        errors = []
+        
+        # Lowercase once and share it with every keyword check
+        prompt_lower = prompt.lower()
         
         # Check length
-        self._check_length(prompt)
+        self._check_length(prompt, warnings, errors)
         
         # Check for contradictory emotions
-        self._check_emotions(prompt)
+        self._check_emotions(prompt, warnings, errors, prompt_lower)
         
         # Check structure based on type
-        if scene_info.get('has_character', True):
-            self._validate_character_prompt(prompt)
+        if has_character:
+            self._validate_character_prompt(prompt, warnings, errors, prompt_lower)
         else:
-            self._validate_broll_prompt(prompt)
+            self._validate_broll_prompt(prompt, warnings, errors, prompt_lower)
         
         # Check for required elements
-        self._check_required_elements(prompt, scene_info)
+        self._check_required_elements(prompt, scene_info, warnings, errors, prompt_lower)
         
         # Sora 2 Pro specific checks
-        self._check_text_overlays(prompt)
-        self._check_audio_timing(prompt)
-        self._check_shot_transitions(prompt)
+        timings = self._RE_TIMINGS.findall(prompt)
+        self._check_text_overlays(prompt, warnings, errors, prompt_lower, timings)
+        self._check_audio_timing(prompt, warnings, errors, timings)
+        self._check_shot_transitions(prompt, warnings, errors, prompt_lower)
         
         # No errors = valid
-        is_valid = len(self.errors) == 0
+        is_valid = len(errors) == 0
         
-        return is_valid, self.warnings.copy(), self.errors.copy()
+        if len(self._result_cache) >= 4096:
+            self._result_cache.clear()
+        self._result_cache[key] = (is_valid, tuple(warnings), tuple(errors))
+        
+        return is_valid, warnings, errors
 
-    def _check_length(self, prompt: str):
+    def _check_length(self, prompt: str, warnings: List[str], errors: List[str]):
         """Check if prompt is within length limits"""
         length = len(prompt)
         
         if length > self.MAX_PROMPT_LENGTH:
-            self.errors.append(
+            errors.append(
                 f"Prompt too long: {length} chars (max: {self.MAX_PROMPT_LENGTH}). "
                 "Condense descriptions."
             )
         elif length > self.MAX_PROMPT_LENGTH * 0.8:
-            self.warnings.append(
+            warnings.append(
                 f"Prompt near limit: {length} chars (max: {self.MAX_PROMPT_LENGTH}). "
                 "Consider condensing."
             )
 
-    def _check_emotions(self, prompt: str):
+    def _check_emotions(self, prompt: str, warnings: List[str], errors: List[str], prompt_lower: str = None):
         """Check for contradictory emotions"""
-        prompt_lower = prompt.lower()
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
+        present = set(self._RE_EMOTIONS.findall(prompt_lower))
+        if len(present) < 2:
+            return
         
         for emotion1, emotion2 in self.CONTRADICTORY_EMOTIONS:
-            if emotion1 in prompt_lower and emotion2 in prompt_lower:
-                self.errors.append(
+            if emotion1 in present and emotion2 in present:
+                errors.append(
                     f"Contradictory emotions detected: '{emotion1}' and '{emotion2}'. "
                     "Use single coherent emotion."
                 )
 
-    def _validate_character_prompt(self, prompt: str):
+    def _validate_character_prompt(self, prompt: str, warnings: List[str], errors: List[str], prompt_lower: str = None):
         """Validate character scene prompt"""
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
+        
         # Check for character description
-        if not any(indicator in prompt.lower() for indicator in ['female', 'male', 'person', 'age']):
-            self.warnings.append("No clear character description found. Add age, gender, key traits.")
+        if not any(indicator in prompt_lower for indicator in ['female', 'male', 'person', 'age']):
+            warnings.append("No clear character description found. Add age, gender, key traits.")
         
         # Check for camera direction
-        if not any(word in prompt.lower() for word in ['camera', 'shot', 'dolly', 'push', 'pan']):
-            self.warnings.append("No camera direction specified. Add camera movement for visual interest.")
+        if not any(word in prompt_lower for word in ['camera', 'shot', 'dolly', 'push', 'pan']):
+            warnings.append("No camera direction specified. Add camera movement for visual interest.")
         
         # Check for script/voiceover
         if '"' not in prompt:
-            self.warnings.append("No quoted script found. Include dialogue for clarity.")
+            warnings.append("No quoted script found. Include dialogue for clarity.")
 
-    def _validate_broll_prompt(self, prompt: str):
+    def _validate_broll_prompt(self, prompt: str, warnings: List[str], errors: List[str], prompt_lower: str = None):
         """Validate B-roll scene prompt"""
-        # Check for forbidden people references
-        prompt_lower = prompt.lower()
-        found_people_refs = []
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
         
-        for forbidden in self.BROLL_FORBIDDEN:
-            if forbidden in prompt_lower:
-                found_people_refs.append(forbidden)
+        # Check for forbidden people references
+        found_people_refs = list(dict.fromkeys(self._RE_BROLL_FORBIDDEN.findall(prompt_lower)))
         
         if found_people_refs:
-            self.errors.append(
+            errors.append(
                 f"B-roll contains people references: {', '.join(found_people_refs)}. "
                 "B-roll must have NO people visible (Sora limitation)."
             )
         
         # Check for visual storytelling
         if not any(word in prompt_lower for word in ['visual', 'show', 'reveal', 'camera', 'footage']):
-            self.warnings.append("Limited visual storytelling. Add more cinematic description.")
+            warnings.append("Limited visual storytelling. Add more cinematic description.")
 
-    def _check_required_elements(self, prompt: str, scene_info: Dict):
+    def _check_required_elements(self, prompt: str, scene_info: Dict, warnings: List[str], errors: List[str],
+                                prompt_lower: str = None):
         """Check for required structural elements"""
-        prompt_lower = prompt.lower()
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
         
         # Duration
         if 'duration' not in prompt_lower and '12 second' not in prompt_lower:
-            self.warnings.append("No duration specified. Add 'Duration: 12 seconds'.")
+            warnings.append("No duration specified. Add 'Duration: 12 seconds'.")
         
         # Style
         if 'style' not in prompt_lower:
-            self.warnings.append("No style specified. Add visual style description.")
+            warnings.append("No style specified. Add visual style description.")
         
         # Quality
         if 'quality' not in prompt_lower and '4k' not in prompt_lower:
-            self.warnings.append("No quality specified. Add '4K' or quality descriptor.")
+            warnings.append("No quality specified. Add '4K' or quality descriptor.")
 
-    def _check_text_overlays(self, prompt: str):
+    def _check_text_overlays(self, prompt: str, warnings: List[str], errors: List[str],
+                             prompt_lower: str = None, timings: List[Tuple[str, str, str]] = None):
         """Check text overlay count and formatting (Sora 2 Pro)"""
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
+        if timings is None:
+            timings = self._RE_TIMINGS.findall(prompt)
+        
         # Count text overlay instructions
-        text_count = prompt.lower().count('text ')
-        text_count += prompt.lower().count('overlay')
-        text_count += len(re.findall(r'at \d+:\d+.*?:.*?".*?"', prompt, re.IGNORECASE))
+        text_count = prompt_lower.count('text ') + prompt_lower.count('overlay')
+        text_count += self._count_timed_text(prompt)
         
         if text_count > self.MAX_TEXT_OVERLAYS:
-            self.errors.append(
+            errors.append(
                 f"Too many text overlays: {text_count} (max: {self.MAX_TEXT_OVERLAYS}). "
                 "Reduce text for readability."
             )
         
         # Check for proper text timing format
-        text_timings = re.findall(r'at (\d+:\d+)', prompt, re.IGNORECASE)
-        for timing in text_timings:
-            parts = timing.split(':')
-            if len(parts) == 2:
-                mins, secs = int(parts[0]), int(parts[1])
-                if mins > 0 or secs > 12:
-                    self.errors.append(
-                        f"Invalid text timing: {timing}. Must be within 0:00-0:12 range."
-                    )
+        for keyword, mins, secs in timings:
+            if keyword.lower() != 'at':
+                continue
+            if int(mins) > 0 or int(secs) > 12:
+                errors.append(
+                    f"Invalid text timing: {mins}:{secs}. Must be within 0:00-0:12 range."
+                )
+
+    def _count_timed_text(self, prompt: str) -> int:
+        """
+        Count timed text instructions like 'At 0:03: "Save now"'
+
+        Same matches as findall(r'at \d+:\d+.*?:.*?".*?"') but in linear time:
+        that regex backtracks cubically on long lines with many timings
+        (seconds for a few thousand chars), this walks each line once.
+        """
+        count = 0
+        for line in prompt.split('\n'):
+            resume = 0
+            for match in self._RE_TEXT_AT.finditer(line):
+                if match.start() < resume:
+                    continue
+                colon = line.find(':', match.end())
+                open_quote = line.find('"', colon + 1) if colon != -1 else -1
+                close_quote = line.find('"', open_quote + 1) if open_quote != -1 else -1
+                if close_quote == -1:
+                    # Later timings on this line can't complete either
+                    break
+                count += 1
+                resume = close_quote + 1
+        return count
 
-    def _check_audio_timing(self, prompt: str):
+    def _check_audio_timing(self, prompt: str, warnings: List[str], errors: List[str],
+                            timings: List[Tuple[str, str, str]] = None):
         """Check audio cues don't overlap (Sora 2 Pro)"""
         # Extract all audio timings
-        audio_timings = re.findall(r'(?:at|from|start) (\d+:\d+)', prompt, re.IGNORECASE)
+        if timings is None:
+            timings = self._RE_TIMINGS.findall(prompt)
         
-        if len(audio_timings) > self.MAX_AUDIO_CUES:
-            self.warnings.append(
-                f"Many audio cues: {len(audio_timings)}. May sound cluttered."
+        if len(timings) > self.MAX_AUDIO_CUES:
+            warnings.append(
+                f"Many audio cues: {len(timings)}. May sound cluttered."
             )
         
         # Check for realistic timing (simplified check)
-        times = []
-        for timing in audio_timings:
-            parts = timing.split(':')
-            if len(parts) == 2:
-                mins, secs = int(parts[0]), int(parts[1])
-                total_secs = mins * 60 + secs
-                times.append(total_secs)
-        
-        # Check for very close timings (< 1 second apart)
+        times = [int(mins) * 60 + int(secs) for _, mins, secs in timings]
+        
+        # Check for very close timings (< 1 second apart); one warning however
+        # many pairs clash, so a cluttered prompt doesn't flood the report
         times.sort()
-        for i in range(len(times) - 1):
-            if times[i+1] - times[i] < 1:
-                self.warnings.append(
-                    f"Audio cues very close together ({times[i]}s and {times[i+1]}s). "
-                    "May sound rushed."
-                )
+        close_pairs = [(a, b) for a, b in zip(times, times[1:]) if b - a < 1]
+        if len(close_pairs) == 1:
+            warnings.append(
+                f"Audio cues very close together ({close_pairs[0][0]}s and {close_pairs[0][1]}s). "
+                "May sound rushed."
+            )
+        elif close_pairs:
+            warnings.append(
+                f"{len(close_pairs)} pairs of audio cues very close together "
+                f"(first at {close_pairs[0][0]}s and {close_pairs[0][1]}s). May sound rushed."
+            )
 
-    def _check_shot_transitions(self, prompt: str):
+    def _check_shot_transitions(self, prompt: str, warnings: List[str], errors: List[str], prompt_lower: str = None):
         """Check shot transitions are logical (Sora 2 Pro)"""
-        # Look for jarring transitions
-        jarring_patterns = [
-            (r'extreme close-up.*extreme close-up', 'Two extreme close-ups in sequence'),
-            (r'whip pan.*whip pan', 'Multiple whip pans in sequence'),
-            (r'crash zoom.*crash zoom', 'Multiple crash zooms in sequence')
-        ]
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
         
-        prompt_lower = prompt.lower()
-        for pattern, warning_msg in jarring_patterns:
-            if re.search(pattern, prompt_lower):
-                self.warnings.append(
+        # Look for jarring transitions
+        for pattern, warning_msg in self._JARRING_TRANSITIONS:
+            if pattern.search(prompt_lower):
+                warnings.append(
                     f"Potentially jarring transition: {warning_msg}. "
                     "Vary shot types for better flow."
                 )
@@ -2,12 +2,16 @@
 Settings Manager
 Manages system settings and prompts stored in Supabase
 """
-import json
+import threading
+import time
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from modules.supabase_client import SupabaseClient
 
+# Upper bound on cached entries (rows plus category lists)
+_CACHE_MAX_ENTRIES = 1024
+
 
 class SettingsManager:
     """Manages settings stored in Supabase with caching"""
@@ -15,9 +19,81 @@ class SettingsManager:
     def __init__(self):
         """Initialize settings manager"""
         self.client = SupabaseClient()
-        self._cache = {}
-        self._cache_time = {}
-        self._cache_ttl = timedelta(minutes=5)  # Cache for 5 minutes
+        self._cache: Dict[str, tuple] = {}  # cache_key -> (value, cached_at)
+        self._cache_ttl = 300.0  # Cache for 5 minutes (monotonic seconds)
+        self._prefetched_at = None  # Last time the whole table was cached
+        self._lock = threading.RLock()  # Guards the cache dicts across request threads
+        self.version = 0  # Bumped on every write/cache clear so consumers can reload
+
+    def _cache_get(self, cache_key: str) -> Any:
+        """Return a fresh cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None and time.monotonic() - entry[1] < self._cache_ttl:
+                return entry[0]
+            return None
+
+    def _cache_put(self, cache_key: str, value: Any, now: Optional[float] = None):
+        """Cache a value, evicting expired entries when the cache is full"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if cache_key not in self._cache and len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._cache = {
+                    k: entry for k, entry in self._cache.items()
+                    if now - entry[1] < self._cache_ttl
+                }
+                if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                    self._cache = {}
+            self._cache[cache_key] = (value, now)
+
+    def _cache_drop(self, *cache_keys: str):
+        """Remove entries from the cache (missing keys are ignored)"""
+        with self._lock:
+            for cache_key in cache_keys:
+                self._cache.pop(cache_key, None)
+            self.version += 1
+
+    def _cache_rows(self, rows: List[Dict]):
+        """Cache every row individually and as its category's list"""
+        now = time.monotonic()
+        by_category = {}
+        with self._lock:
+            for row in rows:
+                self._cache_put(f"{row['category']}:{row['key']}", row, now)
+                by_category.setdefault(row['category'], []).append(row)
+
+            for category, settings in by_category.items():
+                settings.sort(key=lambda setting: setting['key'])
+                self._cache_put(f"category:{category}", settings, now)
+
+    def prefetch_all(self) -> bool:
+        """
+        Load the whole settings table into the cache with one query
+
+        Startup reads (Gemini prompt, Sora config, aggression presets) are then
+        served from the cache instead of one round-trip each.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            response = self.client.client.table('settings')\
+                .select('*')\
+                .execute()
+        except Exception as e:
+            print(f"Error prefetching settings: {e}")
+            return False
+
+        self._cache_rows(response.data or [])
+        self._prefetched_at = time.monotonic()
+        return True
+
+    def _prefetch_if_stale(self) -> bool:
+        """Prefetch the table unless a prefetch is still within the TTL"""
+        if self._prefetched_at is not None and time.monotonic() - self._prefetched_at < self._cache_ttl:
+            return False
+        return self.prefetch_all()
 
     def get_setting(
         self,
@@ -39,10 +115,16 @@ class SettingsManager:
         cache_key = f"{category}:{key}"
 
         # Check cache
-        if use_cache and cache_key in self._cache:
-            cache_time = self._cache_time.get(cache_key)
-            if cache_time and datetime.now() - cache_time < self._cache_ttl:
-                return self._cache[cache_key]
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        # A miss usually means a cold or expired cache: refill all of it at once
+        if use_cache and self._prefetch_if_stale():
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
 
         # Fetch from database
         try:
@@ -55,8 +137,7 @@ class SettingsManager:
             if response.data and len(response.data) > 0:
                 setting = response.data[0]
                 # Cache the result
-                self._cache[cache_key] = setting
-                self._cache_time[cache_key] = datetime.now()
+                self._cache_put(cache_key, setting)
                 return setting
 
             return None
@@ -65,6 +146,52 @@ class SettingsManager:
             print(f"Error fetching setting {category}:{key}: {e}")
             return None
 
+    def get_settings_bulk(
+        self,
+        category: str,
+        keys: List[str],
+        use_cache: bool = True
+    ) -> Dict[str, Dict]:
+        """
+        Get several settings of one category in a single query
+
+        Args:
+            category: Setting category
+            keys: Setting keys to fetch
+            use_cache: Whether to use cached values
+
+        Returns:
+            Dict of key -> setting for the keys that exist
+        """
+        results = {}
+        missing = []
+        for key in keys:
+            cached = self._cache_get(f"{category}:{key}") if use_cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                missing.append(key)
+
+        if not missing:
+            return results
+
+        # Fetch every uncached key with one round-trip
+        try:
+            response = self.client.client.table('settings')\
+                .select('*')\
+                .eq('category', category)\
+                .in_('key', missing)\
+                .execute()
+
+            for setting in response.data or []:
+                self._cache_put(f"{category}:{setting['key']}", setting)
+                results[setting['key']] = setting
+
+        except Exception as e:
+            print(f"Error fetching settings {category}:{', '.join(missing)}: {e}")
+
+        return results
+
     def get_settings_by_category(
         self,
         category: str,
@@ -83,10 +210,15 @@ class SettingsManager:
         cache_key = f"category:{category}"
 
         # Check cache
-        if use_cache and cache_key in self._cache:
-            cache_time = self._cache_time.get(cache_key)
-            if cache_time and datetime.now() - cache_time < self._cache_ttl:
-                return self._cache[cache_key]
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        if use_cache and self._prefetch_if_stale():
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
 
         # Fetch from database
         try:
@@ -99,8 +231,7 @@ class SettingsManager:
             settings = response.data or []
 
             # Cache the result
-            self._cache[cache_key] = settings
-            self._cache_time[cache_key] = datetime.now()
+            self._cache_put(cache_key, settings)
 
             return settings
 
@@ -165,17 +296,8 @@ class SettingsManager:
                 .eq('key', key)\
                 .execute()
 
-            # Clear cache for this setting
-            cache_key = f"{category}:{key}"
-            if cache_key in self._cache:
-                del self._cache[cache_key]
-                del self._cache_time[cache_key]
-
-            # Clear category cache
-            category_cache_key = f"category:{category}"
-            if category_cache_key in self._cache:
-                del self._cache[category_cache_key]
-                del self._cache_time[category_cache_key]
+            # Clear cache for this setting and its category
+            self._cache_drop(f"{category}:{key}", f"category:{category}")
 
             return True
 
@@ -221,10 +343,7 @@ class SettingsManager:
                 .execute()
 
             # Clear category cache
-            category_cache_key = f"category:{category}"
-            if category_cache_key in self._cache:
-                del self._cache[category_cache_key]
-                del self._cache_time[category_cache_key]
+            self._cache_drop(f"category:{category}")
 
             return True
 
@@ -255,15 +374,7 @@ class SettingsManager:
                 .execute()
 
             # Clear cache
-            cache_key = f"{category}:{key}"
-            if cache_key in self._cache:
-                del self._cache[cache_key]
-                del self._cache_time[cache_key]
-
-            category_cache_key = f"category:{category}"
-            if category_cache_key in self._cache:
-                del self._cache[category_cache_key]
-                del self._cache_time[category_cache_key]
+            self._cache_drop(f"{category}:{key}", f"category:{category}")
 
             return True
 
@@ -273,8 +384,10 @@ class SettingsManager:
 
     def clear_cache(self):
         """Clear all cached settings"""
-        self._cache = {}
-        self._cache_time = {}
+        with self._lock:
+            self._cache = {}
+            self._prefetched_at = None
+            self.version += 1
 
     # Convenience methods for specific settings
 
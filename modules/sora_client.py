@@ -2,15 +2,118 @@
 Sora Client - Parallel Video Generation
 Handles async Sora API calls, progress monitoring, and video downloads
 """
+import io
 import time
+import queue
 import asyncio
+import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional
 from pathlib import Path
 from openai import OpenAI
 
 from config import Config
 
+# Status polling backoff: ceiling of the first wait, and the largest ceiling.
+# Short jobs are noticed within seconds; long-running ones settle at an
+# average of 15s between polls.
+_POLL_INITIAL_SECONDS = 2.0
+_POLL_MAX_SECONDS = 20.0
+
+
+def _next_poll_delay(attempt: int, cap: float = _POLL_MAX_SECONDS) -> float:
+    """
+    Seconds to wait before the next status poll
+
+    Exponential backoff with "equal jitter" (a random wait between half and
+    all of the backoff ceiling), so scenes started together don't poll in
+    lockstep.
+
+    Args:
+        attempt: Number of polls already made for this job
+        cap: Longest delay to return
+
+    Returns:
+        Delay in seconds
+    """
+    # Clamp the exponent: the ceiling hits any sane cap long before 2**16,
+    # and an unbounded power overflows float after ~1000 polls
+    ceiling = min(cap, _POLL_INITIAL_SECONDS * 2 ** min(attempt, 16))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+# Download chunk size; large enough that the Python loop isn't the bottleneck
+_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+
+class _ChunkPipe(io.RawIOBase):
+    """
+    Bounded in-memory pipe: one thread feeds chunks, another reads a stream
+
+    Lets an upload consume a download while it is still in progress. Feeding
+    an exception makes the reader raise it (aborting the upload); feeding
+    None is EOF.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        self._queue = queue.Queue(max_chunks)
+        self._buffer = memoryview(b"")
+        self._eof = False
+        self.reader_done = threading.Event()  # set once the reader stops consuming
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            self._buffer = memoryview(item)
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        # Fill the whole request unless EOF is reached: s3transfer treats a
+        # short first read as the end of the stream and falls back to a
+        # single buffered put_object instead of a multipart upload
+        if size is None or size < 0:
+            return self.readall()
+
+        buf = bytearray(size)
+        view = memoryview(buf)
+        filled = 0
+        while filled < size:
+            n = self.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        view.release()
+        del buf[filled:]
+        return bytes(buf)
+
+    def feed(self, item) -> bool:
+        """Queue a chunk, None (EOF) or an exception; False if the reader has stopped"""
+        while not self.reader_done.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
 
 class SoraClient:
     """Client for interacting with Sora API via direct REST calls"""
@@ -30,6 +133,16 @@ class SoraClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+
+        # One keep-alive pool for every create/poll/download call to the API.
+        # Only idempotent GETs are retried: a retried POST could start a
+        # duplicate (billed) job.
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = self.headers["Authorization"]
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self.session.mount('https://', adapter)
+
         self.spaces_client = spaces_client
         self.session_id = session_id
 
@@ -65,7 +178,7 @@ class SoraClient:
         try:
             # Direct REST API call
             print(f"▸ Sending POST request to Sora API...")
-            response = requests.post(self.base_url, headers=self.headers, json=params, timeout=30)
+            response = self.session.post(self.base_url, json=params, timeout=30)
 
             print(f"▸ Response status code: {response.status_code}")
 
@@ -110,7 +223,7 @@ class SoraClient:
             Status dictionary
         """
         # Direct REST API call
-        response = requests.get(f"{self.base_url}/{video_id}", headers=self.headers)
+        response = self.session.get(f"{self.base_url}/{video_id}")
         response.raise_for_status()
         data = response.json()
 
@@ -123,19 +236,20 @@ class SoraClient:
             'error': data.get('error')
         }
 
-    def wait_for_completion(self, video_id: str, poll_interval: int = 15) -> Dict:
+    def wait_for_completion(self, video_id: str, poll_interval: float = _POLL_MAX_SECONDS) -> Dict:
         """
         Poll until video is complete
 
         Args:
             video_id: Video job ID
-            poll_interval: Seconds between polls
+            poll_interval: Longest wait between polls (polls start within 2s and back off)
 
         Returns:
             Final status dictionary
         """
         print(f"Monitoring job {video_id}...")
 
+        attempt = 0
         while True:
             status = self.get_video_status(video_id)
 
@@ -148,7 +262,8 @@ class SoraClient:
             else:
                 progress = status.get('progress', 0)
                 print(f"  Progress: {progress}% [{status['status']}]")
-                time.sleep(poll_interval)
+                time.sleep(_next_poll_delay(attempt, poll_interval))
+                attempt += 1
 
     def download_video(self, video_id: str, output_path: Optional[str] = None) -> Dict:
         """
@@ -170,30 +285,57 @@ class SoraClient:
         print(f"Downloading video {video_id}...")
 
         # Download content via REST API
-        download_headers = {"Authorization": f"Bearer {self.api_key}"}
-        response = requests.get(f"{self.base_url}/{video_id}/content", headers=download_headers, stream=True)
+        response = self.session.get(f"{self.base_url}/{video_id}/content", stream=True)
         response.raise_for_status()
 
+        # Upload to Spaces if client available, streaming the download into
+        # the upload as it arrives instead of re-reading the saved file
+        pipe = None
+        upload = {}
+        if self.spaces_client and self.session_id:
+            print(f"  Uploading to Spaces...")
+            pipe = _ChunkPipe()
+
+            def upload_stream():
+                try:
+                    upload['url'] = self.spaces_client.upload_session_video_stream(
+                        self.session_id,
+                        pipe,
+                        output_path.name,
+                        'generated'
+                    )
+                except Exception as e:
+                    upload['error'] = e
+                finally:
+                    pipe.reader_done.set()
+
+            uploader = threading.Thread(target=upload_stream, daemon=True)
+            uploader.start()
+
         # Save to file
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        try:
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_BYTES):
+                    f.write(chunk)
+                    if pipe:
+                        pipe.feed(chunk)
+        except BaseException as e:
+            if pipe:
+                pipe.feed(e)
+                uploader.join()
+            raise
 
         print(f"✓ Saved to: {output_path}")
 
-        # Upload to Spaces if client available
         cloud_url = None
-        if self.spaces_client and self.session_id:
-            try:
-                print(f"  Uploading to Spaces...")
-                cloud_url = self.spaces_client.upload_session_video(
-                    self.session_id,
-                    str(output_path),
-                    'generated'
-                )
+        if pipe:
+            pipe.feed(None)
+            uploader.join()
+            if 'error' in upload:
+                print(f"  ⚠ Spaces upload failed: {upload['error']}")
+            else:
+                cloud_url = upload['url']
                 print(f"  ✓ Uploaded: {cloud_url}")
-            except Exception as e:
-                print(f"  ⚠ Spaces upload failed: {e}")
 
         return {
             'local_path': str(output_path),
@@ -245,6 +387,58 @@ class SoraClient:
                 'error': result.get('error')
             }
 
+    async def _poll_and_download(self, job: Dict, variant_dir: Path) -> Dict:
+        """
+        Poll one job until it finishes, downloading it as soon as it completes
+
+        Args:
+            job: Job entry with job_id and scene_number
+            variant_dir: Directory for the variant's scene files
+
+        Returns:
+            Scene result dictionary
+        """
+        attempt = 0
+        while True:
+            status = await asyncio.to_thread(self.get_video_status, job['job_id'])
+
+            if status['status'] == 'completed':
+                print(f"  Scene {job['scene_number']}: COMPLETED ✓")
+
+                # Download video
+                filename = f"scene_{job['scene_number']:02d}.mp4"
+                download_result = await asyncio.to_thread(
+                    self.download_video,
+                    job['job_id'],
+                    str(variant_dir / filename)
+                )
+
+                return {
+                    'scene_number': job['scene_number'],
+                    'video_path': download_result['local_path'],
+                    'cloud_url': download_result.get('cloud_url'),
+                    'job_id': job['job_id']
+                }
+
+            if status['status'] == 'failed':
+                print(f"  Scene {job['scene_number']}: FAILED ✗")
+                return {
+                    'scene_number': job['scene_number'],
+                    'status': 'failed',
+                    'error': status.get('error')
+                }
+
+            progress = status.get('progress', 0)
+            print(f"  Scene {job['scene_number']}: {progress}% [{status['status']}]")
+            await asyncio.sleep(_next_poll_delay(attempt))
+            attempt += 1
+
+    async def _monitor_jobs(self, jobs: List[Dict], variant_dir: Path) -> List[Dict]:
+        """Poll all jobs concurrently; results are in job order"""
+        return list(await asyncio.gather(
+            *(self._poll_and_download(job, variant_dir) for job in jobs)
+        ))
+
     def generate_variant_parallel(self, scene_prompts: List[Dict], variant_name: str, 
                                  model: str = None, size: str = None, image_url: str = None) -> Dict:
         """
@@ -281,51 +475,9 @@ class SoraClient:
 
         print(f"\n✓ All {len(jobs)} jobs started. Monitoring progress...")
 
-        # Monitor all jobs
-        completed_videos = []
-        pending_jobs = jobs.copy()
-
-        while pending_jobs:
-            print(f"\n--- Progress Update ---")
-            print(f"Pending: {len(pending_jobs)} | Completed: {len(completed_videos)}")
-
-            for job in pending_jobs[:]:  # Copy list to modify during iteration
-                status = self.get_video_status(job['job_id'])
-
-                if status['status'] == 'completed':
-                    print(f"  Scene {job['scene_number']}: COMPLETED ✓")
-
-                    # Download video
-                    filename = f"scene_{job['scene_number']:02d}.mp4"
-                    download_result = self.download_video(
-                        job['job_id'],
-                        str(variant_dir / filename)
-                    )
-
-                    completed_videos.append({
-                        'scene_number': job['scene_number'],
-                        'video_path': download_result['local_path'],
-                        'cloud_url': download_result.get('cloud_url'),
-                        'job_id': job['job_id']
-                    })
-
-                    pending_jobs.remove(job)
-
-                elif status['status'] == 'failed':
-                    print(f"  Scene {job['scene_number']}: FAILED ✗")
-                    completed_videos.append({
-                        'scene_number': job['scene_number'],
-                        'status': 'failed',
-                        'error': status.get('error')
-                    })
-                    pending_jobs.remove(job)
-
-                else:
-                    progress = status.get('progress', 0)
-                    print(f"  Scene {job['scene_number']}: {progress}% [{status['status']}]")
-
-            if pending_jobs:
-                time.sleep(15)  # Poll every 15 seconds
+        # Monitor all jobs: each one polls and downloads independently, so a
+        # finished scene is fetched right away instead of after the sweep
+        completed_videos = asyncio.run(self._monitor_jobs(jobs, variant_dir))
 
         # Sort by scene number
         completed_videos.sort(key=lambda x: x['scene_number'])
@@ -2,9 +2,120 @@
 Sora Prompt Builder - OPTIMIZED FOR CONVERSIONS
 Builds concise, cinematic prompts with proven UGC formulas
 """
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 import re
 
+# Age ("25", "25-30", "25 to 30") in a spokesperson description
+_AGE_RE = re.compile(r'(\d+)[-\s]?(to|-)?\s?(\d+)?')
+
+
+@lru_cache(maxsize=128)
+def _condense_description(full_description: str) -> str:
+    """Condensed form of a spokesperson description (see _condense_character)"""
+    desc_lower = full_description.lower()
+
+    # Extract age
+    age_match = _AGE_RE.search(full_description)
+    if age_match:
+        age = age_match.group(1) if not age_match.group(3) else f"{age_match.group(1)}-{age_match.group(3)}"
+    else:
+        # Try to extract age descriptors
+        if 'early to mid-20' in desc_lower or '20s' in desc_lower:
+            age = '25'
+        elif 'early 30' in desc_lower or '30s' in desc_lower:
+            age = '30'
+        else:
+            age = '30'
+
+    # Extract gender
+    if 'female' in desc_lower or 'woman' in desc_lower:
+        gender = 'female'
+    elif 'male' in desc_lower or 'man' in desc_lower:
+        gender = 'male'
+    else:
+        gender = 'person'
+
+    # Extract hair
+    hair = ''
+    if 'brown hair' in desc_lower:
+        hair = 'brown hair'
+    elif 'blonde' in desc_lower or 'blond' in desc_lower:
+        hair = 'blonde hair'
+    elif 'black hair' in desc_lower:
+        hair = 'black hair'
+    elif 'wavy' in desc_lower:
+        hair = 'wavy hair'
+    elif 'curly' in desc_lower:
+        hair = 'curly hair'
+
+    # Extract clothing
+    clothing = ''
+    if 'white t-shirt' in desc_lower or 'white tee' in desc_lower:
+        clothing = 'white tee'
+    elif 'casual' in desc_lower:
+        clothing = 'casual outfit'
+
+    # Construct concise description
+    parts = [gender, age]
+    if hair:
+        parts.append(hair)
+    if clothing:
+        parts.append(clothing)
+
+    return ', '.join(parts)
+
+
+# Sentence boundaries: whitespace after ., ! or ?
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+@lru_cache(maxsize=64)
+def _split_script(script: str, purposes: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Script segments per scene (see _split_script_intelligently)
+
+    Cached because every variant of an ad splits the same script over the
+    same scene purposes.
+    """
+    # Split by sentences
+    sentences = _SENTENCE_SPLIT_RE.split(script.strip())
+
+    if len(purposes) == 1:
+        # For Scene 1 only, extract just the opening hook (first 1-2 sentences)
+        hook_sentences = sentences[:2] if len(sentences) >= 2 else sentences[:1]
+        return (' '.join(hook_sentences),)
+
+    # Map scene purposes to script segments
+    parts = []
+
+    # Distribute sentences based on purpose
+    sentences_per_scene = len(sentences) // len(purposes)
+    remainder = len(sentences) % len(purposes)
+
+    idx = 0
+    for i, purpose in enumerate(purposes):
+        # Allocate more sentences to hook and CTA scenes
+        purpose_lower = purpose.lower()
+        if 'hook' in purpose_lower or 'cta' in purpose_lower:
+            count = sentences_per_scene + 1
+        else:
+            count = sentences_per_scene
+
+        # Add remainder to early scenes
+        if i < remainder:
+            count += 1
+
+        scene_sentences = sentences[idx:idx+count]
+        parts.append(' '.join(scene_sentences))
+        idx += count
+
+    # Handle any remaining sentences
+    if idx < len(sentences):
+        parts[-1] += ' ' + ' '.join(sentences[idx:])
+
+    return tuple(parts)
+
 
 class SoraPromptBuilder:
     """Builds high-converting Sora 2 prompts with cinematic storytelling"""
@@ -211,57 +322,7 @@ Symbolic storytelling through objects/environment only.
         
         Extract: age, gender, key visual traits, clothing
         """
-        desc_lower = full_description.lower()
-        
-        # Extract age
-        age_match = re.search(r'(\d+)[-\s]?(to|-)?\s?(\d+)?', full_description)
-        if age_match:
-            age = age_match.group(1) if not age_match.group(3) else f"{age_match.group(1)}-{age_match.group(3)}"
-        else:
-            # Try to extract age descriptors
-            if 'early to mid-20' in desc_lower or '20s' in desc_lower:
-                age = '25'
-            elif 'early 30' in desc_lower or '30s' in desc_lower:
-                age = '30'
-            else:
-                age = '30'
-        
-        # Extract gender
-        if 'female' in desc_lower or 'woman' in desc_lower:
-            gender = 'female'
-        elif 'male' in desc_lower or 'man' in desc_lower:
-            gender = 'male'
-        else:
-            gender = 'person'
-        
-        # Extract hair
-        hair = ''
-        if 'brown hair' in desc_lower:
-            hair = 'brown hair'
-        elif 'blonde' in desc_lower or 'blond' in desc_lower:
-            hair = 'blonde hair'
-        elif 'black hair' in desc_lower:
-            hair = 'black hair'
-        elif 'wavy' in desc_lower:
-            hair = 'wavy hair'
-        elif 'curly' in desc_lower:
-            hair = 'curly hair'
-        
-        # Extract clothing
-        clothing = ''
-        if 'white t-shirt' in desc_lower or 'white tee' in desc_lower:
-            clothing = 'white tee'
-        elif 'casual' in desc_lower:
-            clothing = 'casual outfit'
-        
-        # Construct concise description
-        parts = [gender, age]
-        if hair:
-            parts.append(hair)
-        if clothing:
-            parts.append(clothing)
-        
-        return ', '.join(parts)
+        return _condense_description(full_description)
 
     def build_all_scene_prompts(self, variant: Dict, spokesperson_description: str, full_script: str) -> List[Dict]:
         """
@@ -310,45 +371,8 @@ Symbolic storytelling through objects/environment only.
         
         Aligns script segments with narrative beats
         """
-        # Split by sentences
-        sentences = re.split(r'(?<=[.!?])\s+', script.strip())
-        
-        if len(scenes) == 1:
-            # For Scene 1 only, extract just the opening hook (first 1-2 sentences)
-            sentences = re.split(r'(?<=[.!?])\s+', script.strip())
-            # Take only the first 1-2 sentences for the hook
-            hook_sentences = sentences[:2] if len(sentences) >= 2 else sentences[:1]
-            return [' '.join(hook_sentences)]
-        
-        # Map scene purposes to script segments
-        parts = []
-        scene_purposes = [s.get('purpose', '') for s in scenes]
-        
-        # Distribute sentences based on purpose
-        sentences_per_scene = len(sentences) // len(scenes)
-        remainder = len(sentences) % len(scenes)
-        
-        idx = 0
-        for i, purpose in enumerate(scene_purposes):
-            # Allocate more sentences to hook and CTA scenes
-            if 'hook' in purpose.lower() or 'cta' in purpose.lower():
-                count = sentences_per_scene + 1
-            else:
-                count = sentences_per_scene
-            
-            # Add remainder to early scenes
-            if i < remainder:
-                count += 1
-            
-            scene_sentences = sentences[idx:idx+count]
-            parts.append(' '.join(scene_sentences))
-            idx += count
-        
-        # Handle any remaining sentences
-        if idx < len(sentences):
-            parts[-1] += ' ' + ' '.join(sentences[idx:])
-        
-        return parts
+        purposes = tuple(scene.get('purpose', '') for scene in scenes)
+        return list(_split_script(script, purposes))
 
     def format_for_sora_api(self, prompt_data: Dict) -> Dict:
         """Format prompt data for Sora API call"""
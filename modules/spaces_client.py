@@ -5,7 +5,7 @@ S3-compatible storage for videos and media
 import os
 import boto3
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from botocore.client import Config
 from datetime import datetime
 
@@ -66,6 +66,17 @@ class SpacesClient:
                 }
             )
 
+    def _video_extra_args(self, make_public: bool) -> dict:
+        """Upload arguments shared by file and stream uploads"""
+        extra_args = {
+            'ContentType': 'video/mp4'
+        }
+
+        if make_public:
+            extra_args['ACL'] = 'public-read'
+
+        return extra_args
+
     def upload_video(
         self,
         local_path: str,
@@ -83,24 +94,43 @@ class SpacesClient:
         Returns:
             Public URL of uploaded file
         """
-        extra_args = {
-            'ContentType': 'video/mp4'
-        }
-
-        if make_public:
-            extra_args['ACL'] = 'public-read'
-
         # Upload file
         self.client.upload_file(
             local_path,
             self.bucket_name,
             remote_path,
-            ExtraArgs=extra_args
+            ExtraArgs=self._video_extra_args(make_public)
         )
 
         # Return public URL
         return f"{self.public_url}/{remote_path}"
 
+    def upload_video_stream(
+        self,
+        stream: BinaryIO,
+        remote_path: str,
+        make_public: bool = True
+    ) -> str:
+        """
+        Upload video from a readable stream (need not be seekable)
+
+        Args:
+            stream: File-like object to read the video from until EOF
+            remote_path: Remote path in bucket (e.g., 'uploads/video.mp4')
+            make_public: Make file publicly accessible
+
+        Returns:
+            Public URL of uploaded file
+        """
+        self.client.upload_fileobj(
+            stream,
+            self.bucket_name,
+            remote_path,
+            ExtraArgs=self._video_extra_args(make_public)
+        )
+
+        return f"{self.public_url}/{remote_path}"
+
     def download_video(
         self,
         remote_path: str,
@@ -195,13 +225,36 @@ class SpacesClient:
         Returns:
             Public URL
         """
-        # Generate organized path
-        filename = Path(local_path).name
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        remote_path = f"sessions/{session_id}/{video_type}/{timestamp}_{filename}"
-
+        remote_path = self._session_remote_path(session_id, Path(local_path).name, video_type)
         return self.upload_video(local_path, remote_path)
 
+    def upload_session_video_stream(
+        self,
+        session_id: str,
+        stream: BinaryIO,
+        filename: str,
+        video_type: str = 'upload'
+    ) -> str:
+        """
+        Upload a session video from a stream, e.g. while it is still downloading
+
+        Args:
+            session_id: Pipeline session ID
+            stream: File-like object to read the video from until EOF
+            filename: File name to store it under
+            video_type: Type (upload, generated, final)
+
+        Returns:
+            Public URL
+        """
+        remote_path = self._session_remote_path(session_id, filename, video_type)
+        return self.upload_video_stream(stream, remote_path)
+
+    def _session_remote_path(self, session_id: str, filename: str, video_type: str) -> str:
+        """Organized bucket path for a session video"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"sessions/{session_id}/{video_type}/{timestamp}_{filename}"
+
     def list_session_videos(self, session_id: str) -> dict:
         """
         List all videos for a session
@@ -16,6 +16,8 @@ import subprocess
 import tempfile
 import shutil
 
+from modules.persistence import dumps_json
+
 
 @dataclass
 class ExtensionRequest:
@@ -86,13 +88,11 @@ class VideoExtensionEngine:
     
     def _save_requests(self):
         """Save requests to storage"""
-        with open(self.requests_file, 'w') as f:
-            json.dump(self.requests, f, indent=2)
+        self.requests_file.write_bytes(dumps_json(self.requests))
     
     def _save_results(self):
         """Save results to storage"""
-        with open(self.results_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        self.results_file.write_bytes(dumps_json(self.results))
     
     def create_extension_request(self, video_path: str, target_duration: int, 
                                extension_type: str = 'loop', style_consistency: bool = True) -> str:
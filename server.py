@@ -16,6 +16,7 @@ from ad_cloner import Scene1Generator
 from modules.ab_testing import ABTestingSuite
 from modules.video_extension import VideoExtensionEngine
 from modules.logger import PipelineLogger, get_logger
+from modules.persistence import load_json, load_jsonl
 from modules.supabase_client import SupabaseClient
 from modules.spaces_client import SpacesClient
 from modules.settings_manager import get_settings_manager
@@ -91,6 +92,14 @@ def list_sessions():
     return jsonify({'sessions': sessions})
 
 
+def _load_session_events(session_dir: Path):
+    """Load a session's events (events.jsonl, or events.json from older sessions)"""
+    events = load_jsonl(session_dir / 'events.jsonl')
+    if events is None:
+        events = load_json(session_dir / 'events.json')
+    return events
+
+
 @app.route('/api/sessions/<session_id>', methods=['GET'])
 def get_session(session_id):
     """Get session details"""
@@ -100,7 +109,6 @@ def get_session(session_id):
         return jsonify({'error': 'Session not found'}), 404
 
     progress_file = session_dir / 'progress.json'
-    events_file = session_dir / 'events.json'
 
     response = {}
 
@@ -108,11 +116,10 @@ def get_session(session_id):
         with open(progress_file) as f:
             response['progress'] = json.load(f)
 
-    if events_file.exists():
-        with open(events_file) as f:
-            events = json.load(f)
-            # Get last 100 events
-            response['events'] = events[-100:]
+    events = _load_session_events(session_dir)
+    if events is not None:
+        # Get last 100 events
+        response['events'] = events[-100:]
 
     return jsonify(response)
 
@@ -121,17 +128,16 @@ def get_session(session_id):
 def get_session_events(session_id):
     """Get session events with optional filtering"""
     session_dir = Config.LOGS_DIR / session_id
-    events_file = session_dir / 'events.json'
+    events = _load_session_events(session_dir)
 
-    if not events_file.exists():
+    if events is None:
         return jsonify({'error': 'Session not found'}), 404
 
-    with open(events_file) as f:
-        events = json.load(f)
-
     # Filter by timestamp if provided
     since = request.args.get('since')
     if since:
+        # Linear filter: the file may interleave events from several loggers
+        # (and older sessions), so it is not guaranteed to be in time order
         events = [e for e in events if e['timestamp'] > since]
 
     return jsonify({'events': events})
@@ -361,6 +367,11 @@ def start_clone():
                 'error': str(e)
             })
 
+        finally:
+            # Release both loggers' listener threads and files
+            ws_logger.close()
+            logger.close()
+
     thread = threading.Thread(target=run_pipeline)
     thread.daemon = True
     thread.start()
@@ -807,18 +818,21 @@ def generate_from_preview():
         
         # Start generation in background
         def run_generation():
-            from ad_cloner import Scene1Generator
-            cloner = Scene1Generator(logger=logger)
-            
-            # Load analysis
-            with open(preview_data['analysis_path']) as f:
-                analysis = json.load(f)
-            
-            # Run from step 4 onwards (generation)
-            prompts = preview_data['prompts']
-            
-            # TODO: Continue from here with Sora generation
-            # This would be the same as ad_cloner.py steps 4-6
+            try:
+                from ad_cloner import Scene1Generator
+                cloner = Scene1Generator(logger=logger)
+
+                # Load analysis
+                with open(preview_data['analysis_path']) as f:
+                    analysis = json.load(f)
+
+                # Run from step 4 onwards (generation)
+                prompts = preview_data['prompts']
+
+                # TODO: Continue from here with Sora generation
+                # This would be the same as ad_cloner.py steps 4-6
+            finally:
+                logger.close()
             
         import threading
         thread = threading.Thread(target=run_generation)
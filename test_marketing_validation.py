@@ -2,7 +2,7 @@
 Test Marketing Validation Pipeline
 """
 import json
-from modules.aggression_variants import AggressionVariantGenerator
+from modules.aggression_variants import get_variant_generator
 from modules.ad_director import AdDirector
 from modules.marketing_validator import MarketingValidator
 from modules.sora_prompt_composer import SoraPromptComposer
@@ -24,7 +24,7 @@ def test_full_pipeline():
     print(f"Vertical: {vertical}\n")
     
     # Generate variants
-    variant_gen = AggressionVariantGenerator()
+    variant_gen = get_variant_generator()
     all_variants = variant_gen.generate_variants(analysis)
     aggressive_variant = next(v for v in all_variants if v['variant_level'] == 'aggressive')
     
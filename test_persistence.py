@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test JSON encoding/decoding with and without orjson installed
+"""
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import modules.persistence as persistence
+from modules.persistence import dumps_json, loads_json
+
+SAMPLE = {
+    'session_id': 'session_1',
+    'created_at': datetime(2026, 1, 2, 3, 4, 5),
+    'path': Path('output/videos/scene_1.mp4'),
+    'scenes': {1: {'duration': 4.5, 'tags': ['hook', 'cta']}},
+    2.5: None,
+    'empty': {'list': [], 'dict': {}},
+}
+
+# What SAMPLE should decode to: non-str keys become strings and values that
+# aren't JSON types are written as str()
+EXPECTED = {
+    'session_id': 'session_1',
+    'created_at': '2026-01-02 03:04:05',
+    'path': 'output/videos/scene_1.mp4',
+    'scenes': {'1': {'duration': 4.5, 'tags': ['hook', 'cta']}},
+    '2.5': None,
+    'empty': {'list': [], 'dict': {}},
+}
+
+
+@contextmanager
+def _backend(use_orjson: bool):
+    """Run with orjson (if installed) or with the stdlib fallback"""
+    saved = persistence.orjson
+    if not use_orjson:
+        persistence.orjson = None
+    try:
+        yield
+    finally:
+        persistence.orjson = saved
+
+
+def test_round_trip_both_backends():
+    """dumps_json/loads_json round-trip the same data with either backend"""
+    for use_orjson in (True, False):
+        with _backend(use_orjson):
+            for indent in (2, None, 4):
+                encoded = dumps_json(SAMPLE, indent=indent)
+                assert isinstance(encoded, bytes)
+                assert loads_json(encoded) == EXPECTED
+                assert loads_json(encoded.decode()) == EXPECTED
+
+
+def test_pretty_output_matches_stdlib():
+    """Indented output is byte-identical to json.dumps(indent=2, default=str)"""
+    stdlib = json.dumps(SAMPLE, indent=2, default=str).encode()
+    for use_orjson in (True, False):
+        with _backend(use_orjson):
+            assert dumps_json(SAMPLE) == stdlib
+
+
+def test_fallback_compact_output():
+    """Without orjson, compact output is the stdlib's default formatting"""
+    with _backend(False):
+        assert dumps_json({'a': [1, 2], 3: datetime(2026, 1, 2)}, indent=None) == \
+            b'{"a": [1, 2], "3": "2026-01-02 00:00:00"}'
+
+
+def test_invalid_json_raises_decode_error():
+    """Both backends raise json.JSONDecodeError on bad input"""
+    for use_orjson in (True, False):
+        with _backend(use_orjson):
+            try:
+                loads_json(b'{"unterminated": ')
+            except json.JSONDecodeError:
+                pass
+            else:
+                raise AssertionError("expected JSONDecodeError")
+
+
+if __name__ == "__main__":
+    test_round_trip_both_backends()
+    test_pretty_output_matches_stdlib()
+    test_fallback_compact_output()
+    test_invalid_json_raises_decode_error()
+    print("✓ Persistence tests passed")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test that Sora downloads stream into Spaces as a multipart upload
+"""
+import tempfile
+from pathlib import Path
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+from modules.sora_client import SoraClient, _DOWNLOAD_CHUNK_BYTES
+from modules.spaces_client import SpacesClient
+
+# Larger than s3transfer's default 8 MiB multipart threshold
+VIDEO_BYTES = 20 * 1024 * 1024
+
+
+class _FakeRaw:
+    """Minimal urllib3-like body for a canned botocore response"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def stream(self, *args, **kwargs):
+        yield self._body
+
+
+class _FakeResponse:
+    """Streaming requests response yielding VIDEO_BYTES of data"""
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        sent = 0
+        while sent < VIDEO_BYTES:
+            n = min(chunk_size, VIDEO_BYTES - sent)
+            yield b"\0" * n
+            sent += n
+
+
+class _FakeSession:
+    def get(self, url, stream=False):
+        return _FakeResponse()
+
+
+def _fake_spaces(operations: list) -> SpacesClient:
+    """SpacesClient whose S3 calls are answered locally and recorded"""
+    client = boto3.client(
+        's3',
+        region_name='us-east-1',
+        aws_access_key_id='test',
+        aws_secret_access_key='test'
+    )
+
+    def answer(request, event_name, **kwargs):
+        operation = event_name.rsplit('.', 1)[-1]
+        operations.append(operation)
+        headers = {}
+        body = b""
+        if operation == 'CreateMultipartUpload':
+            body = (b"<InitiateMultipartUploadResult><Bucket>bucket</Bucket>"
+                    b"<Key>key</Key><UploadId>upload-1</UploadId>"
+                    b"</InitiateMultipartUploadResult>")
+        elif operation in ('UploadPart', 'PutObject'):
+            headers['ETag'] = '"etag"'
+        elif operation == 'CompleteMultipartUpload':
+            body = (b"<CompleteMultipartUploadResult><Bucket>bucket</Bucket>"
+                    b"<Key>key</Key><ETag>\"etag\"</ETag>"
+                    b"</CompleteMultipartUploadResult>")
+        return AWSResponse(request.url, 200, headers, _FakeRaw(body))
+
+    client.meta.events.register('before-send.s3.*', answer)
+
+    spaces = SpacesClient.__new__(SpacesClient)
+    spaces.client = client
+    spaces.bucket_name = 'bucket'
+    spaces.public_url = 'https://bucket.example.com'
+    return spaces
+
+
+def test_download_streams_multipart_upload():
+    """A download above the multipart threshold is uploaded in parts"""
+    operations = []
+
+    sora = SoraClient.__new__(SoraClient)
+    sora.base_url = "https://api.openai.com/v1/videos"
+    sora.session = _FakeSession()
+    sora.spaces_client = _fake_spaces(operations)
+    sora.session_id = 'session-1'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp) / "video.mp4"
+        result = sora.download_video('video-1', output_path)
+
+        assert output_path.stat().st_size == VIDEO_BYTES
+
+    assert result['cloud_url'].startswith('https://bucket.example.com/sessions/session-1/generated/')
+    assert 'PutObject' not in operations
+    assert operations[0] == 'CreateMultipartUpload'
+    assert operations.count('UploadPart') >= 2
+    assert operations[-1] == 'CompleteMultipartUpload'
+
+
+def test_chunk_pipe_fills_reads():
+    """read(n) returns n bytes until EOF even when chunks are smaller"""
+    from modules.sora_client import _ChunkPipe
+
+    pipe = _ChunkPipe(max_chunks=8)
+    for _ in range(4):
+        pipe.feed(b"x" * _DOWNLOAD_CHUNK_BYTES)
+    pipe.feed(None)
+
+    assert len(pipe.read(3 * _DOWNLOAD_CHUNK_BYTES)) == 3 * _DOWNLOAD_CHUNK_BYTES
+    assert len(pipe.read(3 * _DOWNLOAD_CHUNK_BYTES)) == _DOWNLOAD_CHUNK_BYTES
+    assert pipe.read(1) == b""
+
+
+if __name__ == "__main__":
+    test_chunk_pipe_fills_reads()
+    test_download_streams_multipart_upload()
+    print("✓ Streaming upload tests passed")
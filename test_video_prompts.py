@@ -5,7 +5,7 @@ import json
 from pathlib import Path
 from modules.gemini_analyzer import GeminiVideoAnalyzer
 from modules.sora_transformer import SoraAdTransformer
-from modules.aggression_variants import AggressionVariantGenerator
+from modules.aggression_variants import get_variant_generator
 from modules.ad_director import AdDirector
 from modules.sora_prompt_composer import SoraPromptComposer
 
@@ -41,7 +41,7 @@ def test_video_prompts(video_path: str, variant: str = 'aggressive'):
     
     # Generate variants
     print(f"\n📊 Generating aggression variants...")
-    variant_gen = AggressionVariantGenerator()
+    variant_gen = get_variant_generator()
     all_variants = variant_gen.generate_variants(analysis)
     
     # Get requested variant